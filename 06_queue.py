@@ -2,8 +2,11 @@
 Задание 6. Очередь
 
 Реализация очереди на циклическом массиве и на двух стеках.
+Очередь с агрегатами (min/max/sum) и скользящее окно за O(n).
 """
 
+from collections import deque
+
 
 class CircularArrayQueue:
     """
@@ -144,6 +147,156 @@ class StackQueue:
         return len(self.stack_in) + len(self.stack_out)
 
 
+class AggregateQueue(StackQueue):
+    """
+    Очередь на двух стеках с поддержкой min/max/sum за O(1).
+
+    Каждый элемент стека хранится вместе с агрегатами всех элементов
+    под ним, поэтому агрегат всей очереди - комбинация вершин двух стеков.
+    """
+    
+    def enqueue(self, value):
+        """
+        Добавление элемента в очередь.
+        
+        Временная сложность: O(1)
+        """
+        if self.stack_in:
+            _, low, high, total = self.stack_in[-1]
+            self.stack_in.append((value, min(low, value), max(high, value), total + value))
+        else:
+            self.stack_in.append((value, value, value, value))
+    
+    def _transfer(self):
+        """Перенос элементов из stack_in в stack_out с пересчётом агрегатов."""
+        stack_in = self.stack_in
+        stack_out = self.stack_out
+        value = stack_in.pop()[0]
+        stack_out.append((value, value, value, value))
+        while stack_in:
+            value = stack_in.pop()[0]
+            _, low, high, total = stack_out[-1]
+            stack_out.append((value, min(low, value), max(high, value), total + value))
+    
+    def dequeue(self):
+        """
+        Извлечение элемента из очереди.
+        
+        Амортизированная временная сложность: O(1)
+        """
+        if self.isEmpty():
+            raise IndexError("Очередь пуста")
+        if not self.stack_out:
+            self._transfer()
+        return self.stack_out.pop()[0]
+    
+    def peek(self):
+        """
+        Просмотр первого элемента без извлечения.
+        
+        Амортизированная временная сложность: O(1)
+        """
+        if self.isEmpty():
+            raise IndexError("Очередь пуста")
+        if not self.stack_out:
+            self._transfer()
+        return self.stack_out[-1][0]
+    
+    push = enqueue
+    pop = dequeue
+    
+    def _aggregate(self, field: int, combine):
+        if self.isEmpty():
+            raise IndexError("Очередь пуста")
+        if not self.stack_in:
+            return self.stack_out[-1][field]
+        if not self.stack_out:
+            return self.stack_in[-1][field]
+        return combine(self.stack_in[-1][field], self.stack_out[-1][field])
+    
+    def min(self):
+        """
+        Минимум элементов очереди.
+        
+        Временная сложность: O(1)
+        """
+        return self._aggregate(1, min)
+    
+    def max(self):
+        """
+        Максимум элементов очереди.
+        
+        Временная сложность: O(1)
+        """
+        return self._aggregate(2, max)
+    
+    def sum(self):
+        """
+        Сумма элементов очереди.
+        
+        Временная сложность: O(1)
+        """
+        return self._aggregate(3, lambda a, b: a + b)
+
+
+def sliding_window(iterable, k: int, agg=min):
+    """
+    Агрегат (min, max или sum) по скользящему окну размера k.
+    
+    Для min/max используется монотонная очередь (deque индексов),
+    для sum - AggregateQueue, поэтому погрешность не накапливается.
+    Результаты выдаются по мере чтения потока, начиная с k-го элемента.
+    
+    Временная сложность: O(n) суммарно, где n - длина потока
+    Пространственная сложность: O(k)
+    
+    Args:
+        iterable: Поток чисел
+        k: Размер окна
+        agg: min, max, sum или их названия ('min', 'max', 'sum')
+        
+    Yields:
+        Значение агрегата для каждого полного окна
+    """
+    if k <= 0:
+        raise ValueError("Размер окна должен быть положительным")
+    
+    name = agg if isinstance(agg, str) else getattr(agg, "__name__", None)
+    if name not in ("min", "max", "sum"):
+        raise ValueError(f"Неизвестная агрегатная функция: {agg}")
+    
+    if name == "sum":
+        window = AggregateQueue()
+        for value in iterable:
+            window.enqueue(value)
+            if len(window) > k:
+                window.dequeue()
+            if len(window) == k:
+                yield window.sum()
+        return
+    
+    # Монотонная очередь: значения в окне, которые ещё могут стать ответом
+    window = deque()
+    if name == "min":
+        for i, value in enumerate(iterable):
+            while window and window[-1][1] >= value:
+                window.pop()
+            window.append((i, value))
+            if window[0][0] <= i - k:
+                window.popleft()
+            if i >= k - 1:
+                yield window[0][1]
+    else:
+        for i, value in enumerate(iterable):
+            while window and window[-1][1] <= value:
+                window.pop()
+            window.append((i, value))
+            if window[0][0] <= i - k:
+                window.popleft()
+            if i >= k - 1:
+                yield window[0][1]
+
+
 if __name__ == "__main__":
     print("=== Тестирование очереди на циклическом массиве ===")
     queue1 = CircularArrayQueue(5)
@@ -172,5 +325,17 @@ if __name__ == "__main__":
     print(f"dequeue() = {queue2.dequeue()}")
     print(f"dequeue() = {queue2.dequeue()}")
     print(f"dequeue() = {queue2.dequeue()}")
-
-
+    
+    print("\n=== Тестирование очереди с агрегатами ===")
+    queue3 = AggregateQueue()
+    for value in [5, 1, 4, 2, 3]:
+        queue3.push(value)
+    print(f"После push(5,1,4,2,3): min={queue3.min()}, max={queue3.max()}, sum={queue3.sum()}")
+    print(f"pop() = {queue3.pop()}, pop() = {queue3.pop()}")
+    print(f"После двух pop(): min={queue3.min()}, max={queue3.max()}, sum={queue3.sum()}")
+    
+    print("\n=== Скользящее окно (k=3) ===")
+    data = [4, 2, 12, 11, -5, 7, 3, 8]
+    print(f"Данные: {data}")
+    for agg in (min, max, sum):
+        print(f"{agg.__name__}: {list(sliding_window(data, 3, agg))}")
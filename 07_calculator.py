@@ -2,16 +2,371 @@
 Задание 7. Калькулятор
 
 Преобразование выражения из инфиксной формы в обратную польскую нотацию (ОПН)
-и вычисление результата.
+и вычисление результата. Поддерживаются именованные переменные,
+пакетное вычисление формулы по столбцам данных, компиляция в функцию Python
+и оптимизация (свёртка констант, устранение общих подвыражений).
 """
 
+import io
+import re
+import time
+import math
+import keyword
+import operator
+import unicodedata
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Коды операторов в типизированной ОПН: код - индекс в OPERATORS
+OPERATORS = ('+', '-', '*', '/', '^')
+OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_POW = range(len(OPERATORS))
+OP_CODES = {symbol: code for code, symbol in enumerate(OPERATORS)}
+
+
+def _divide(a, b):
+    """Деление с проверкой на ноль."""
+    if b == 0:
+        raise ValueError("Деление на ноль")
+    return a / b
+
+
+# Таблица диспетчеризации: код оператора -> функция
+OPERATIONS = (operator.add, operator.sub, operator.mul, _divide, operator.pow)
+
+
+def _divide_arrays(a, b):
+    """Поэлементное деление столбцов с проверкой на ноль."""
+    if np.any(b == 0):
+        raise ValueError("Деление на ноль")
+    return np.divide(a, b)
+
+
+def _power_arrays(a, b):
+    """
+    Поэлементное возведение в степень с семантикой operator.pow:
+    отрицательное основание с дробным показателем даёт комплексное
+    число (np.power вернул бы nan), ноль в отрицательной степени
+    вызывает ZeroDivisionError, а переполнение при конечных аргументах -
+    OverflowError (np.power вернул бы inf с предупреждением). Комплексные
+    элементы вычисляются самим operator.pow.
+    """
+    if np.iscomplexobj(a) or np.iscomplexobj(b):
+        return np.frompyfunc(operator.pow, 2, 1)(a, b).astype(complex)
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    finite = np.isfinite(a) & np.isfinite(b)
+    if np.any((a == 0) & (b < 0) & np.isfinite(b)):
+        raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+    complex_rows = (a < 0) & (b != np.floor(b)) & np.isfinite(b)
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        result = np.power(a, b)
+    if np.any(np.isinf(result) & finite & ~complex_rows):
+        raise OverflowError(34, "Numerical result out of range")
+    if not complex_rows.any():
+        return result
+    result = np.asarray(result, dtype=complex)
+    result[complex_rows] = [x ** y for x, y in zip(a[complex_rows].tolist(),
+                                                   b[complex_rows].tolist())]
+    return result
+
+
+if np is not None:
+    NUMPY_OPERATIONS = (np.add, np.subtract, np.multiply, _divide_arrays, _power_arrays)
+
+
+# Сканер токенов: число | имя переменной | оператор или скобка | прочий символ
+TOKEN_PATTERN = re.compile(r"[0-9.]+|[^\W\d_]\w*|[-+*/^()]|\S")
+# Недопустимые символы: не входящие ни в один токен, а также '_' в начале токена
+INVALID_PATTERN = re.compile(r"[^\w\s.+\-*/^()]|(?<!\w)\d*_")
+
+
+class Variable:
+    """Именованная переменная в типизированной ОПН."""
+    
+    __slots__ = ('name',)
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __eq__(self, other):
+        return isinstance(other, Variable) and other.name == self.name
+    
+    def __hash__(self):
+        return hash(self.name)
+    
+    def __repr__(self):
+        return f"Variable({self.name!r})"
+
+
+# Виды узлов ExpressionDAG
+NODE_CONST, NODE_VAR, NODE_OP = range(3)
+
+
+class ExpressionDAG:
+    """
+    Ориентированный ациклический граф (DAG) выражения, построенный по ОПН.
+    
+    Оптимизации:
+    - свёртка констант: операция над двумя константами вычисляется заранее
+      той же функцией из OPERATIONS (если она не вызывает ошибку);
+    - устранение общих подвыражений: одинаковые узлы хранятся один раз.
+    
+    Обе оптимизации выполняют те же операции с плавающей точкой в том же
+    порядке, поэтому результат побитово совпадает с evaluate_rpn.
+    Исключение - reassociate=True: (x + c1) + c2 заменяется на x + (c1 + c2)
+    (аналогично для *), что может изменить последние биты результата.
+    
+    Узлы: (NODE_CONST, значение), (NODE_VAR, имя), (NODE_OP, код, левый, правый),
+    где левый и правый - номера узлов в program.
+    """
+    
+    def __init__(self, rpn: list, fold: bool = True, cse: bool = True,
+                 reassociate: bool = False):
+        """
+        Построение DAG.
+        
+        Временная сложность: O(n), где n - количество токенов
+        
+        Args:
+            rpn: Типизированная ОПН
+            fold: Выполнять свёртку констант
+            cse: Объединять одинаковые подвыражения
+            reassociate: Разрешить перегруппировку констант в цепочках + и *
+        """
+        self.fold = fold
+        self.cse = cse
+        self.reassociate = reassociate
+        self.nodes = []
+        self._index = {}
+        self.nodes_before = len(rpn)
+        
+        stack = []
+        for token in rpn:
+            cls = token.__class__
+            if cls is float:
+                stack.append(self._const(token))
+            elif cls is Variable:
+                stack.append(self._add((NODE_VAR, token.name)))
+            else:
+                if len(stack) < 2:
+                    raise ValueError("Недостаточно операндов для операции")
+                b = stack.pop()
+                a = stack.pop()
+                stack.append(self._operation(token, a, b))
+        
+        if len(stack) != 1:
+            raise ValueError("Некорректное выражение")
+        
+        self.program = self._linearize(stack[0])
+        self.nodes_after = len(self.program)
+        self.variables = [node[1] for node in self.program if node[0] == NODE_VAR]
+    
+    def _add(self, node: tuple) -> int:
+        """Добавление узла (или поиск уже существующего при cse=True)."""
+        if self.cse:
+            # -0.0 == 0.0, поэтому константы сравниваются по двоичному виду
+            key = (NODE_CONST, node[1].hex()) if node[0] == NODE_CONST else node
+            index = self._index.get(key)
+            if index is None:
+                index = self._index[key] = len(self.nodes)
+                self.nodes.append(node)
+            return index
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+    
+    def _const(self, value: float) -> int:
+        return self._add((NODE_CONST, value))
+    
+    def _fold(self, code: int, a: float, b: float):
+        """Вычисление операции над константами (None, если нельзя)."""
+        try:
+            result = OPERATIONS[code](a, b)
+        except (ValueError, ArithmeticError):
+            return None
+        return result if result.__class__ is float else None
+    
+    def _operation(self, code: int, a: int, b: int) -> int:
+        nodes = self.nodes
+        left = nodes[a]
+        right = nodes[b]
+        if self.fold and left[0] == NODE_CONST and right[0] == NODE_CONST:
+            result = self._fold(code, left[1], right[1])
+            if result is not None:
+                return self._const(result)
+        
+        if (self.reassociate and code in (OP_ADD, OP_MUL) and right[0] == NODE_CONST
+                and left[0] == NODE_OP and left[1] == code):
+            for inner, other in ((left[3], left[2]), (left[2], left[3])):
+                if nodes[inner][0] == NODE_CONST:
+                    result = self._fold(code, nodes[inner][1], right[1])
+                    if result is not None:
+                        return self._operation(code, other, self._const(result))
+        
+        return self._add((NODE_OP, code, a, b))
+    
+    def _linearize(self, root: int) -> list:
+        """
+        Узлы, достижимые из корня, в топологическом порядке
+        (потомки раньше родителей; корень - последний).
+        """
+        nodes = self.nodes
+        order = {}
+        program = []
+        stack = [(root, False)]
+        while stack:
+            index, expanded = stack.pop()
+            if index in order:
+                continue
+            node = nodes[index]
+            if node[0] != NODE_OP:
+                order[index] = len(program)
+                program.append(node)
+            elif expanded:
+                order[index] = len(program)
+                program.append((NODE_OP, node[1], order[node[2]], order[node[3]]))
+            else:
+                stack.append((index, True))
+                stack.append((node[3], False))
+                stack.append((node[2], False))
+        return program
+    
+    def evaluate(self, variables: dict = None) -> float:
+        """
+        Вычисление оптимизированной программы.
+        
+        Временная сложность: O(m), где m - количество узлов DAG
+        """
+        values = []
+        push = values.append
+        for node in self.program:
+            kind = node[0]
+            if kind == NODE_OP:
+                push(OPERATIONS[node[1]](values[node[2]], values[node[3]]))
+            elif kind == NODE_CONST:
+                push(node[1])
+            else:
+                if variables is None or node[1] not in variables:
+                    raise ValueError(f"Неизвестная переменная: {node[1]}")
+                push(variables[node[1]])
+        return values[-1]
+    
+    def to_rpn(self) -> list:
+        """
+        Типизированная ОПН после свёртки констант.
+        
+        ОПН не умеет ссылаться на уже вычисленное значение, поэтому общие
+        подвыражения в ней повторяются; полностью оптимизированная форма -
+        program или compile().
+        """
+        program = self.program
+        rpn = []
+        stack = [len(program) - 1]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is not int:
+                rpn.append(item[0])
+                continue
+            node = program[item]
+            if node[0] == NODE_CONST:
+                rpn.append(node[1])
+            elif node[0] == NODE_VAR:
+                rpn.append(Variable(node[1]))
+            else:
+                stack.append((node[1],))
+                stack.append(node[3])
+                stack.append(node[2])
+        return rpn
+    
+    def compile(self):
+        """
+        Генерация функции Python: по одной временной переменной
+        на каждый узел-операцию DAG.
+        
+        Временная сложность: O(m), где m - количество узлов DAG
+        """
+        names = list(dict.fromkeys(self.variables))
+        # Служебные имена кода (_ValueError, _c0, _t0, _v0...) начинаются с '_',
+        # поэтому запрет '_' в начале не даёт переменной их перекрыть
+        parameters = {}
+        for name in names:
+            if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_'):
+                raise ValueError(f"Недопустимое имя переменной: {name}")
+            # Python нормализует идентификаторы в коде по NFKC ("ﬁ" -> "fi"),
+            # поэтому такое имя заменяется служебным, иначе разные
+            # переменные выражения совпали бы в сгенерированном коде
+            if unicodedata.normalize("NFKC", name) != name:
+                parameters[name] = f"_v{len(parameters)}"
+            else:
+                parameters[name] = name
+        
+        lines = []
+        operands = []
+        constants = {}
+        temporaries = 0
+        for node in self.program:
+            kind = node[0]
+            if kind == NODE_CONST:
+                value = node[1]
+                if not math.isfinite(value):
+                    # У inf и nan нет литерала: значение передаётся через
+                    # пространство имён как есть (вместе со знаком)
+                    name = f"_c{len(constants)}"
+                    constants[name] = value
+                    operands.append(name)
+                elif math.copysign(1.0, value) < 0:
+                    operands.append(f"({value!r})")
+                else:
+                    operands.append(repr(value))
+            elif kind == NODE_VAR:
+                operands.append(parameters[node[1]])
+            else:
+                code = node[1]
+                a = operands[node[2]]
+                b = operands[node[3]]
+                if code == OP_DIV:
+                    divisor = self.program[node[3]]
+                    if divisor[0] != NODE_CONST or divisor[1] == 0:
+                        lines.append(f"if {b} == 0: raise _ValueError('Деление на ноль')")
+                    op = '/'
+                elif code == OP_POW:
+                    op = '**'
+                else:
+                    op = OPERATORS[code]
+                target = f"_t{temporaries}"
+                temporaries += 1
+                lines.append(f"{target} = {a} {op} {b}")
+                operands.append(target)
+        
+        body = "".join(f"    {line}\n" for line in lines)
+        source = (f"def _compiled({', '.join(parameters.values())}):\n"
+                  f"{body}    return {operands[-1]}\n")
+        namespace = {"__builtins__": {}, "_ValueError": ValueError, **constants}
+        exec(source, namespace)
+        function = namespace["_compiled"]
+        function.variables = names
+        function.source = source
+        return function
+
 
 class Calculator:
     """
     Калькулятор, использующий обратную польскую нотацию.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
+        """
+        Args:
+            cache_size: Максимальное количество скомпилированных выражений
+                в LRU-кэше (0 - кэш отключён)
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._functions = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.precedence = {
             '+': 1,
             '-': 1,
@@ -34,39 +389,130 @@ class Calculator:
             expression: Выражение в инфиксной форме (например, "3 + 4 * 2")
             
         Returns:
-            Список токенов в ОПН (например, ['3', '4', '2', '*', '+'])
+            Типизированная ОПН: числа - float, операторы - коды из OPERATORS,
+            переменные - Variable (например, [3.0, 4.0, 2.0, OP_MUL, OP_ADD])
         """
-        output = []
-        stack = []
+        return list(self.iter_rpn(self._tokenize(expression)))
+    
+    def infix_to_rpn_stream(self, source, chunk_size: int = 1 << 16):
+        """
+        Потоковое преобразование в ОПН: токены читаются из строки или
+        файлового объекта порциями и сразу передаются алгоритму
+        сортировочной станции, поэтому список токенов не хранится целиком.
+        
+        Временная сложность: O(n), где n - длина выражения
+        Пространственная сложность: O(d + chunk_size), где d - глубина
+        вложенности операторов
         
-        tokens = self._tokenize(expression)
+        Args:
+            source: Строка или объект с методом read()
+            chunk_size: Размер порции чтения в символах
+            
+        Yields:
+            Токены типизированной ОПН
+        """
+        return self.iter_rpn(self.iter_tokens(source, chunk_size))
+    
+    def iter_rpn(self, tokens):
+        """
+        Алгоритм сортировочной станции над потоком строковых токенов.
+        
+        Выходные токены выдаются, как только их позиция в ОПН определена.
+        Непарные скобки вызывают ValueError.
+        
+        Yields:
+            Токены типизированной ОПН
+        """
+        stack = []
+        precedence = self.precedence
         
         for token in tokens:
-            if self._is_number(token):
-                output.append(token)
-            elif token == '(':
+            if token == '(':
                 stack.append(token)
             elif token == ')':
                 while stack and stack[-1] != '(':
-                    output.append(stack.pop())
+                    yield OP_CODES[stack.pop()]
+                if not stack:
+                    raise ValueError("Лишняя закрывающая скобка")
                 stack.pop()
-            elif token in self.precedence:
+            elif token in OP_CODES:
                 while (stack and 
                        stack[-1] != '(' and
-                       self.precedence[stack[-1]] >= self.precedence[token]):
-                    output.append(stack.pop())
+                       precedence[stack[-1]] >= precedence[token]):
+                    yield OP_CODES[stack.pop()]
                 stack.append(token)
+            elif token[0].isalpha():
+                yield Variable(token)
+            else:
+                try:
+                    yield float(token)
+                except ValueError:
+                    raise ValueError(f"Некорректное число: {token}") from None
         
         while stack:
-            output.append(stack.pop())
-        
-        return output
+            token = stack.pop()
+            if token == '(':
+                raise ValueError("Незакрытая скобка")
+            yield OP_CODES[token]
     
     def _tokenize(self, expression: str) -> list:
         """
-        Разбиение выражения на токены.
+        Разбиение выражения на токены за один проход
+        предкомпилированным регулярным выражением TOKEN_PATTERN.
+        
+        Поддерживает числа, переменные (буква, затем буквы, цифры или _)
+        и операторы: +, -, *, /, ^, (, )
+        
+        Временная сложность: O(n), где n - длина выражения
+        """
+        self._check_symbols(expression)
+        return TOKEN_PATTERN.findall(expression)
+    
+    def _check_symbols(self, text: str):
+        """Поиск недопустимого символа одним проходом INVALID_PATTERN."""
+        invalid = INVALID_PATTERN.search(text)
+        if invalid is not None:
+            raise ValueError(f"Неизвестный символ: {invalid.group()[-1]}")
+    
+    def iter_tokens(self, source, chunk_size: int = 1 << 16):
+        """
+        Ленивое разбиение на токены строки или файлового объекта.
         
-        Поддерживает числа и операторы: +, -, *, /, ^, (, )
+        Токен, который может продолжиться в следующей порции (число или имя
+        в самом конце прочитанного), переносится в следующую порцию.
+        
+        Временная сложность: O(n), где n - длина выражения
+        
+        Args:
+            source: Строка или объект с методом read()
+            chunk_size: Размер порции чтения в символах
+            
+        Yields:
+            Строковые токены
+        """
+        if isinstance(source, str):
+            source = io.StringIO(source)
+        
+        carry = ""
+        while True:
+            chunk = source.read(chunk_size)
+            buffer = carry + chunk
+            carry = ""
+            if not buffer:
+                return
+            self._check_symbols(buffer)
+            tokens = TOKEN_PATTERN.findall(buffer)
+            if chunk and tokens and buffer[-1] == tokens[-1][-1] and (
+                    buffer[-1].isalnum() or buffer[-1] in '._'):
+                carry = tokens.pop()
+            yield from tokens
+            if not chunk:
+                return
+    
+    def _tokenize_chars(self, expression: str) -> list:
+        """
+        Посимвольное разбиение на токены (прежняя реализация,
+        оставлена для сравнения в compare_tokenizers).
         """
         tokens = []
         i = 0
@@ -81,6 +527,11 @@ class Calculator:
                     num += expression[i]
                     i += 1
                 tokens.append(num)
+            elif expression[i].isalpha():
+                start = i
+                while i < len(expression) and (expression[i].isalnum() or expression[i] == '_'):
+                    i += 1
+                tokens.append(expression[start:i])
             elif expression[i] in '+-*/^()':
                 tokens.append(expression[i])
                 i += 1
@@ -97,17 +548,38 @@ class Calculator:
         except ValueError:
             return False
     
-    def evaluate_rpn(self, rpn: list) -> float:
+    def compile_rpn(self, rpn: list) -> list:
         """
-        Вычисление выражения в ОПН.
+        Преобразование ОПН из списка строк (старый формат)
+        в типизированную ОПН. Типизированные токены остаются без изменений.
         
         Временная сложность: O(n), где n - количество токенов
         
         Args:
-            rpn: Список токенов в ОПН
+            rpn: Список токенов в ОПН (например, ['3', '4', '2', '*', '+'])
             
         Returns:
-            Результат вычисления
+            Типизированная ОПН
+        """
+        program = []
+        for token in rpn:
+            if token.__class__ is not str:
+                program.append(token)
+            elif token in OP_CODES:
+                program.append(OP_CODES[token])
+            elif self._is_number(token):
+                program.append(float(token))
+            elif token.isidentifier():
+                program.append(Variable(token))
+            else:
+                raise ValueError(f"Неизвестная операция: {token}")
+        return program
+    
+    def _evaluate_string_rpn(self, rpn: list) -> float:
+        """
+        Вычисление ОПН из строковых токенов с разбором каждого токена
+        (прежняя реализация evaluate_rpn, оставлена для сравнения
+        в compare_rpn_evaluation).
         """
         stack = []
         
@@ -143,18 +615,498 @@ class Calculator:
         
         return stack[0]
     
-    def calculate(self, expression: str) -> float:
+    def format_rpn(self, rpn: list) -> str:
+        """Строковое представление ОПН (например, "3 4 2 * +")."""
+        parts = []
+        for token in rpn:
+            if token.__class__ is int:
+                parts.append(OPERATORS[token])
+            elif token.__class__ is float:
+                parts.append(str(int(token)) if token.is_integer() else repr(token))
+            elif token.__class__ is Variable:
+                parts.append(token.name)
+            else:
+                parts.append(str(token))
+        return ' '.join(parts)
+    
+    def evaluate_rpn(self, rpn: list, variables: dict = None) -> float:
+        """
+        Вычисление выражения в ОПН.
+        
+        Операторы выполняются через таблицу OPERATIONS без разбора строк.
+        Список строк (старый формат) предварительно преобразуется
+        через compile_rpn.
+        
+        Временная сложность: O(n), где n - количество токенов
+        
+        Args:
+            rpn: Типизированная ОПН или список строковых токенов
+            variables: Значения переменных {имя: число}
+            
+        Returns:
+            Результат вычисления
+        """
+        if rpn and rpn[0].__class__ is str:
+            rpn = self.compile_rpn(rpn)
+        
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        operations = OPERATIONS
+        
+        for token in rpn:
+            cls = token.__class__
+            if cls is float:
+                push(token)
+            elif cls is int:
+                if len(stack) < 2:
+                    raise ValueError("Недостаточно операндов для операции")
+                
+                b = pop()
+                push(operations[token](pop(), b))
+            else:
+                push(self._lookup(token.name, variables))
+        
+        if len(stack) != 1:
+            raise ValueError("Некорректное выражение")
+        
+        return stack[0]
+    
+    def _lookup(self, name: str, variables: dict):
+        """Значение переменной."""
+        if variables is None or name not in variables:
+            raise ValueError(f"Неизвестная переменная: {name}")
+        return variables[name]
+    
+    def variables_of(self, rpn: list) -> list:
+        """
+        Имена переменных выражения в порядке первого появления.
+        
+        Временная сложность: O(n), где n - количество токенов
+        """
+        names = {}
+        for token in rpn:
+            if token.__class__ is Variable:
+                names[token.name] = None
+        return list(names)
+    
+    def _get_program(self, expression: str) -> list:
+        """
+        Получение типизированной ОПН из LRU-кэша
+        (при промахе - разбор выражения).
+        
+        Временная сложность: O(1) при попадании, O(n) при промахе
+        """
+        cache = self._cache
+        program = cache.get(expression)
+        if program is not None:
+            cache.move_to_end(expression)
+            self.cache_hits += 1
+            return program
+        
+        self.cache_misses += 1
+        program = self.infix_to_rpn(expression)
+        self._remember(cache, expression, program)
+        return program
+    
+    def _remember(self, cache: OrderedDict, key, value):
+        """Добавление в LRU-кэш с вытеснением самой старой записи."""
+        if self.cache_size > 0:
+            cache[key] = value
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+    
+    def cache_info(self) -> dict:
+        """
+        Статистика кэша скомпилированных выражений.
+        
+        Returns:
+            Словарь с попаданиями, промахами, текущим и максимальным размером
+        """
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+    
+    def clear_cache(self):
+        """Очистка кэша и статистики."""
+        self._cache.clear()
+        self._functions.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def calculate(self, expression: str, variables: dict = None) -> float:
         """
         Вычисление выражения в инфиксной форме.
         
+        Повторные вычисления того же выражения берут готовую программу
+        из кэша и не выполняют разбор.
+        
         Args:
             expression: Выражение в инфиксной форме
+            variables: Значения переменных {имя: число}
             
         Returns:
             Результат вычисления
         """
-        rpn = self.infix_to_rpn(expression)
-        return self.evaluate_rpn(rpn)
+        return self.evaluate_rpn(self._get_program(expression), variables)
+    
+    def compile(self, expression: str, optimize: bool = False, reassociate: bool = False):
+        """
+        Компиляция выражения в функцию Python.
+        
+        По проверенной типизированной ОПН генерируется линейный код
+        с временными переменными (_t0 = a + b; _t1 = _t0 * c ...), поэтому
+        при вызове не выполняется интерпретация токенов. Параметры функции -
+        переменные выражения в порядке первого появления (атрибут variables);
+        их можно передавать позиционно или по имени (имена, которые Python
+        изменил бы нормализацией NFKC, например "ﬁ", - только позиционно). Деление на ноль
+        вызывает ту же ошибку, что и evaluate_rpn. При optimize=True код
+        строится по ExpressionDAG со свёрткой констант и общими подвыражениями.
+        
+        Временная сложность: O(n) при компиляции, вызов - O(n) операций
+        без накладных расходов интерпретатора ОПН
+        
+        Args:
+            expression: Выражение в инфиксной форме
+            
+        Returns:
+            Функция, вычисляющая выражение
+        """
+        key = (expression, optimize, reassociate)
+        function = self._functions.get(key)
+        if function is not None:
+            self._functions.move_to_end(key)
+            return function
+        
+        function = self.compile_rpn_function(self._get_program(expression),
+                                             optimize, reassociate)
+        self._remember(self._functions, key, function)
+        return function
+    
+    def compile_rpn_function(self, rpn: list, optimize: bool = False,
+                             reassociate: bool = False):
+        """
+        Компиляция типизированной ОПН в функцию Python (см. compile).
+        
+        Временная сложность: O(n), где n - количество токенов
+        """
+        if rpn and rpn[0].__class__ is str:
+            rpn = self.compile_rpn(rpn)
+        return ExpressionDAG(rpn, fold=optimize, cse=optimize,
+                             reassociate=reassociate).compile()
+    
+    def optimize(self, expression: str, reassociate: bool = False) -> ExpressionDAG:
+        """
+        Оптимизация выражения: свёртка констант и устранение общих
+        подвыражений (см. ExpressionDAG).
+        
+        Количество узлов до и после - атрибуты nodes_before и nodes_after.
+        
+        Временная сложность: O(n), где n - количество токенов
+        
+        Args:
+            expression: Выражение в инфиксной форме
+            reassociate: Разрешить перегруппировку констант
+                (результат может отличаться в последних битах)
+        """
+        return ExpressionDAG(self._get_program(expression), reassociate=reassociate)
+    
+    def evaluate_batch(self, expression: str, columns: dict, use_numpy: bool = None):
+        """
+        Вычисление формулы для каждой строки набора столбцов.
+        
+        ОПН строится один раз. При наличии NumPy каждый оператор выполняется
+        одной векторной операцией над целыми столбцами; иначе строки
+        обрабатываются по одной скомпилированной функцией (см. compile).
+        
+        Временная сложность: O(n * m), где n - количество токенов,
+        m - количество строк
+        
+        Args:
+            expression: Выражение в инфиксной форме (например, "(a + b) * c ^ 2")
+            columns: Столбцы значений переменных {имя: массив}
+            use_numpy: Использовать NumPy (None - если установлен)
+            
+        Returns:
+            numpy.ndarray (при векторном вычислении) или список результатов.
+            В обоих случаях отрицательное основание в дробной степени даёт
+            комплексное число, как в calculate (массив тогда имеет тип
+            complex); векторное np.power может отличаться в последнем бите
+            
+        Raises:
+            ZeroDivisionError: Ноль в отрицательной степени (в обоих режимах)
+            OverflowError: Переполнение при возведении в степень (в обоих режимах)
+        """
+        program = self._get_program(expression)
+        names = self.variables_of(program)
+        for name in names:
+            if name not in columns:
+                raise ValueError(f"Неизвестная переменная: {name}")
+        
+        lengths = {len(columns[name]) for name in names}
+        if len(lengths) > 1:
+            raise ValueError("Столбцы должны иметь одинаковую длину")
+        rows = lengths.pop() if lengths else 1
+        
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            if np is None:
+                raise ImportError("Для векторного вычисления требуется NumPy")
+            return self._evaluate_columns(program, columns, rows)
+        
+        function = self.compile(expression)
+        if not names:
+            return [function()] * rows
+        return list(map(function, *(columns[name] for name in names)))
+    
+    def _evaluate_columns(self, program: list, columns: dict, rows: int):
+        """
+        Вычисление типизированной ОПН над столбцами NumPy.
+        
+        Временная сложность: O(n) векторных операций
+        """
+        arrays = {}
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        
+        for token in program:
+            cls = token.__class__
+            if cls is float:
+                push(token)
+            elif cls is int:
+                if len(stack) < 2:
+                    raise ValueError("Недостаточно операндов для операции")
+                b = pop()
+                push(NUMPY_OPERATIONS[token](pop(), b))
+            else:
+                name = token.name
+                if name not in arrays:
+                    arrays[name] = np.asarray(columns[name], dtype=float)
+                push(arrays[name])
+        
+        if len(stack) != 1:
+            raise ValueError("Некорректное выражение")
+        
+        result = stack[0]
+        dtype = complex if np.iscomplexobj(result) else float
+        return np.broadcast_to(np.asarray(result, dtype=dtype), (rows,)).copy()
+
+
+def compare_cached_calculation(repeats: int = 20000):
+    """
+    Сравнение времени повторных вычислений с кэшем и без него.
+    """
+    expressions = [
+        "3 + 4 * 2",
+        "(1 + 2) * (3 + 4) / 5",
+        "2 ^ 10 - 100 / 4 + 7 * (8 - 3)",
+        "((12.5 + 7.5) * 3 - 4) / (2 + 6 ^ 2)",
+    ]
+    
+    print("=== Сравнение вычислений с кэшем и без ===")
+    
+    uncached = Calculator(cache_size=0)
+    start_time = time.time()
+    for i in range(repeats):
+        uncached.evaluate_rpn(uncached.infix_to_rpn(expressions[i % len(expressions)]))
+    uncached_time = time.time() - start_time
+    print(f"Без кэша ({repeats} вычислений): {uncached_time:.4f} сек")
+    
+    cached = Calculator()
+    start_time = time.time()
+    for i in range(repeats):
+        cached.calculate(expressions[i % len(expressions)])
+    cached_time = time.time() - start_time
+    print(f"С кэшем ({repeats} вычислений): {cached_time:.4f} сек")
+    print(f"Статистика кэша: {cached.cache_info()}")
+    
+    print(f"\nУскорение: {uncached_time / cached_time:.2f}x")
+
+
+def compare_rpn_evaluation(terms: int = 200, repeats: int = 2000):
+    """
+    Сравнение вычисления длинной ОПН прежним строковым вычислителем
+    (разбор каждого токена и цепочка if) и типизированной ОПН
+    с таблицей диспетчеризации.
+    """
+    calc = Calculator()
+    expression = " + ".join(f"{i % 9 + 1}.5 * {i % 7 + 1} / 2" for i in range(terms))
+    typed_rpn = calc.infix_to_rpn(expression)
+    string_rpn = calc.format_rpn(typed_rpn).split()
+    
+    print("=== Сравнение вычисления ОПН ===")
+    print(f"Токенов в ОПН: {len(typed_rpn)}")
+    
+    start_time = time.time()
+    for _ in range(repeats):
+        expected = calc._evaluate_string_rpn(string_rpn)
+    string_time = time.time() - start_time
+    print(f"Строковые токены ({repeats} вычислений): {string_time:.4f} сек")
+    result = calc.evaluate_rpn(typed_rpn)
+    print(f"Результаты совпадают: {result == expected} ({result} и {expected})")
+    
+    start_time = time.time()
+    for _ in range(repeats):
+        calc.evaluate_rpn(typed_rpn)
+    typed_time = time.time() - start_time
+    print(f"Типизированные токены ({repeats} вычислений): {typed_time:.4f} сек")
+    
+    print(f"\nУскорение: {string_time / typed_time:.2f}x")
+
+
+def compare_compiled_evaluation(repeats: int = 100000):
+    """
+    Сравнение интерпретации ОПН и вызова скомпилированной функции.
+    """
+    calc = Calculator()
+    expression = "(x * 2 + 1) / (y - 3) ^ 2 + x * y"
+    rpn = calc.infix_to_rpn(expression)
+    function = calc.compile(expression)
+    
+    print("=== Сравнение интерпретации и компиляции ===")
+    print(f"Выражение: {expression}")
+    
+    start_time = time.time()
+    for i in range(repeats):
+        calc.evaluate_rpn(rpn, {"x": float(i), "y": 1.0})
+    rpn_time = time.time() - start_time
+    print(f"evaluate_rpn ({repeats} вычислений): {rpn_time:.4f} сек")
+    
+    start_time = time.time()
+    for i in range(repeats):
+        function(float(i), 1.0)
+    compiled_time = time.time() - start_time
+    print(f"compile ({repeats} вычислений): {compiled_time:.4f} сек")
+    
+    print(f"\nУскорение: {rpn_time / compiled_time:.2f}x")
+
+
+def compare_optimized_evaluation(repeats: int = 100000):
+    """
+    Сравнение неоптимизированной и оптимизированной компиляции выражения
+    с константными подвыражениями и общими подвыражениями.
+    """
+    calc = Calculator()
+    expression = "(x * 2 + 1) / (x * 2 + 1) ^ 2 + (3 * 4 - 2 ^ 3) * (x * 2 + 1)"
+    dag = calc.optimize(expression)
+    plain = calc.compile(expression)
+    optimized = calc.compile(expression, optimize=True)
+    
+    print("=== Сравнение оптимизированной компиляции ===")
+    print(f"Выражение: {expression}")
+    print(f"Узлов до оптимизации: {dag.nodes_before}, после: {dag.nodes_after}")
+    print(f"ОПН после свёртки констант: {calc.format_rpn(dag.to_rpn())}")
+    
+    for x in (0.5, 3.0, 1e10):
+        results = [plain(x), optimized(x), dag.evaluate({"x": x}),
+                   calc.calculate(expression, {"x": x})]
+        if len(set(results)) == 1:
+            print(f"x = {x}: {results[0]}, результаты совпадают")
+        else:
+            print(f"x = {x}: результаты различаются: {results}")
+    
+    start_time = time.time()
+    for i in range(repeats):
+        plain(float(i))
+    plain_time = time.time() - start_time
+    print(f"Без оптимизации ({repeats} вычислений): {plain_time:.4f} сек")
+    
+    start_time = time.time()
+    for i in range(repeats):
+        optimized(float(i))
+    optimized_time = time.time() - start_time
+    print(f"С оптимизацией ({repeats} вычислений): {optimized_time:.4f} сек")
+    
+    print(f"\nУскорение: {plain_time / optimized_time:.2f}x")
+
+
+def compare_tokenizers(size: int = 1 << 20):
+    """
+    Сравнение посимвольного токенизатора, сканера на регулярном выражении
+    и потокового разбора на выражении размером size символов.
+    """
+    calc = Calculator()
+    part = "12.5 + price_1 * (3 - 4.25) / 7 ^ 2 - "
+    expression = part * (size // len(part)) + "1"
+    
+    print("=== Сравнение токенизаторов ===")
+    print(f"Длина выражения: {len(expression)} символов")
+    
+    start_time = time.time()
+    old_tokens = calc._tokenize_chars(expression)
+    chars_time = time.time() - start_time
+    print(f"Посимвольный разбор: {chars_time:.4f} сек, токенов: {len(old_tokens)}")
+    
+    start_time = time.time()
+    new_tokens = calc._tokenize(expression)
+    regex_time = time.time() - start_time
+    print(f"Сканер (регулярное выражение): {regex_time:.4f} сек, "
+          f"ускорение {chars_time / regex_time:.2f}x")
+    print(f"Токены совпадают: {new_tokens == old_tokens}")
+    
+    start_time = time.time()
+    streamed = sum(1 for _ in calc.iter_tokens(io.StringIO(expression)))
+    stream_time = time.time() - start_time
+    print(f"Потоковый сканер: {stream_time:.4f} сек, "
+          f"ускорение {chars_time / stream_time:.2f}x")
+    print(f"Количество токенов совпадает: {streamed == len(old_tokens)}")
+    
+    start_time = time.time()
+    rpn_length = sum(1 for _ in calc.infix_to_rpn_stream(io.StringIO(expression)))
+    print(f"Потоковое преобразование в ОПН: {time.time() - start_time:.4f} сек, "
+          f"токенов ОПН: {rpn_length}")
+
+
+def compare_batch_evaluation(rows: int = 100000):
+    """
+    Сравнение пакетного вычисления формулы с вызовом calculate для каждой строки.
+    """
+    calc = Calculator()
+    expression = "(a + b) * c ^ 2"
+    columns = {
+        "a": [float(i % 100) for i in range(rows)],
+        "b": [float(i % 7) for i in range(rows)],
+        "c": [1.0 + i % 3 for i in range(rows)],
+    }
+    
+    print("=== Сравнение пакетного вычисления ===")
+    print(f"Формула: {expression}, строк: {rows}")
+    
+    start_time = time.time()
+    expected = [calc.calculate(expression, {"a": a, "b": b, "c": c})
+                for a, b, c in zip(columns["a"], columns["b"], columns["c"])]
+    row_time = time.time() - start_time
+    print(f"calculate для каждой строки: {row_time:.4f} сек")
+    
+    start_time = time.time()
+    result = calc.evaluate_batch(expression, columns, use_numpy=False)
+    python_time = time.time() - start_time
+    print(f"evaluate_batch (чистый Python): {python_time:.4f} сек, "
+          f"ускорение {row_time / python_time:.2f}x")
+    print(f"Результаты совпадают: {list(result) == expected}")
+    
+    if np is not None:
+        start_time = time.time()
+        result = calc.evaluate_batch(expression, columns, use_numpy=True)
+        numpy_time = time.time() - start_time
+        print(f"evaluate_batch (NumPy, столбцы-списки): {numpy_time:.4f} сек, "
+              f"ускорение {row_time / numpy_time:.2f}x")
+        print(f"Результаты совпадают: {result.tolist() == expected}")
+        
+        arrays = {name: np.array(values) for name, values in columns.items()}
+        start_time = time.time()
+        result = calc.evaluate_batch(expression, arrays, use_numpy=True)
+        array_time = time.time() - start_time
+        print(f"evaluate_batch (NumPy, столбцы np.ndarray): {array_time:.4f} сек, "
+              f"ускорение {row_time / array_time:.2f}x")
+        print(f"Результаты совпадают: {result.tolist() == expected}")
+    else:
+        print("NumPy не установлен, векторное вычисление пропущено")
 
 
 if __name__ == "__main__":
@@ -176,7 +1128,63 @@ if __name__ == "__main__":
         rpn = calc.infix_to_rpn(expr)
         result = calc.evaluate_rpn(rpn)
         print(f"\nВыражение: {expr}")
-        print(f"ОПН: {' '.join(rpn)}")
+        print(f"ОПН: {calc.format_rpn(rpn)}")
         print(f"Результат: {result}")
-
-
+    
+    print("\n=== Кэш скомпилированных выражений ===")
+    for expr in test_expressions * 2:
+        calc.calculate(expr)
+    print(f"Статистика кэша: {calc.cache_info()}")
+    calc.clear_cache()
+    print(f"После clear_cache(): {calc.cache_info()}")
+    
+    print()
+    compare_cached_calculation()
+    
+    print()
+    compare_rpn_evaluation()
+    
+    print("\n=== Переменные и пакетное вычисление ===")
+    print(f"calculate('(a + b) * c ^ 2', a=1, b=2, c=3) = "
+          f"{calc.calculate('(a + b) * c ^ 2', {'a': 1, 'b': 2, 'c': 3})}")
+    print(f"ОПН: {calc.format_rpn(calc.infix_to_rpn('(a + b) * c ^ 2'))}")
+    batch = calc.evaluate_batch("x * 2 + y", {"x": [1, 2, 3], "y": [10, 20, 30]})
+    print(f"evaluate_batch('x * 2 + y') = {list(batch)}")
+    
+    print()
+    compare_batch_evaluation()
+    
+    print("\n=== Компиляция в функцию Python ===")
+    function = calc.compile("(a + b) * c ^ 2 / d")
+    print(function.source)
+    print(f"f(1, 2, 3, 4) = {function(1, 2, 3, 4)}")
+    print(f"f(a=1, b=2, c=3, d=4) = {function(a=1, b=2, c=3, d=4)}")
+    try:
+        function(1, 2, 3, 0)
+    except ValueError as error:
+        print(f"f(1, 2, 3, 0): {error}")
+    
+    function = calc.compile("ﬁ + fi * 10")
+    print(function.source)
+    print(f"f(1, 2) = {function(1, 2)}, "
+          f"calculate: {calc.calculate('ﬁ + fi * 10', {'ﬁ': 1, 'fi': 2})}")
+    
+    print()
+    compare_compiled_evaluation()
+    
+    print("\n=== Оптимизация выражения ===")
+    dag = calc.optimize("(x*2+1) / (x*2+1)^2")
+    print(f"Узлов до: {dag.nodes_before}, после: {dag.nodes_after}")
+    print(calc.compile("(x*2+1) / (x*2+1)^2", optimize=True).source)
+    dag = calc.optimize("(x + 1) + 2", reassociate=True)
+    print(f"reassociate: {calc.format_rpn(dag.to_rpn())}")
+    
+    print()
+    compare_optimized_evaluation()
+    
+    print("\n=== Потоковый разбор ===")
+    stream = io.StringIO("12.75 * (price + 3) - 100 / total_2")
+    print(f"ОПН: {calc.format_rpn(list(calc.infix_to_rpn_stream(stream, chunk_size=4)))}")
+    
+    print()
+    compare_tokenizers()
@@ -1,29 +1,312 @@
 """
 Задание 8. Своя хэш-таблица
 
-Реализация хэш-таблицы с методом разрешения коллизий (цепочки).
+Реализация хэш-таблицы с методом разрешения коллизий (цепочки)
+и с открытой адресацией (линейное пробирование).
 """
 
+import gc
+import sys
+import time
+import random
+import secrets
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MASK64 = (1 << 64) - 1
+# Множитель фибоначчиева хэширования: 2^64 / золотое сечение
+FIBONACCI_MULTIPLIER = 0x9E3779B97F4A7C15
+
+FNV_OFFSET_BASIS = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+# Пакетное хэширование через NumPy: минимальный размер пакета
+# и максимальная длина ключа (матрица байтов занимает n * длину)
+NUMPY_BATCH_MIN = 64
+NUMPY_MAX_KEY_LENGTH = 256
+
+
+def djb2_hash(key: str, seed: int = 0) -> int:
+    """
+    djb2: h = h * 33 + код символа, начальное значение 5381 ^ seed.
+    
+    Зерно не защищает от подобранных коллизий: равенство хэшей двух
+    строк одной длины не зависит от начального значения.
+    
+    Временная сложность: O(n), где n - длина строки
+    """
+    hash_value = 5381 ^ seed
+    for char in key:
+        hash_value = ((hash_value << 5) + hash_value) + ord(char)
+    return hash_value & MASK64
+
+
+def fnv1a_hash(key: str, seed: int = 0) -> int:
+    """
+    FNV-1a (64 бита) по байтам UTF-8, зерно смешивается с начальным значением.
+    
+    Временная сложность: O(n), где n - длина строки
+    """
+    hash_value = FNV_OFFSET_BASIS ^ seed
+    for byte in key.encode("utf-8"):
+        hash_value = ((hash_value ^ byte) * FNV_PRIME) & MASK64
+    return hash_value
+
+
+def _rotate_left(value: int, bits: int) -> int:
+    return ((value << bits) | (value >> (64 - bits))) & MASK64
+
+
+def _siphash(data: bytes, k0: int, k1: int, c_rounds: int, d_rounds: int) -> int:
+    """
+    SipHash-c-d с 128-битным ключом (k0, k1).
+    
+    Временная сложность: O(n), где n - длина данных
+    """
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+    
+    def rounds(count):
+        nonlocal v0, v1, v2, v3
+        for _ in range(count):
+            v0 = (v0 + v1) & MASK64
+            v1 = _rotate_left(v1, 13) ^ v0
+            v0 = _rotate_left(v0, 32)
+            v2 = (v2 + v3) & MASK64
+            v3 = _rotate_left(v3, 16) ^ v2
+            v0 = (v0 + v3) & MASK64
+            v3 = _rotate_left(v3, 21) ^ v0
+            v2 = (v2 + v1) & MASK64
+            v1 = _rotate_left(v1, 17) ^ v2
+            v2 = _rotate_left(v2, 32)
+    
+    length = len(data)
+    tail = length & ~7
+    for offset in range(0, tail, 8):
+        word = int.from_bytes(data[offset:offset + 8], "little")
+        v3 ^= word
+        rounds(c_rounds)
+        v0 ^= word
+    
+    word = ((length & 0xFF) << 56) | int.from_bytes(data[tail:], "little")
+    v3 ^= word
+    rounds(c_rounds)
+    v0 ^= word
+    
+    v2 ^= 0xFF
+    rounds(d_rounds)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def siphash_hash(key: str, seed: int = 0) -> int:
+    """
+    Ключевой хэш SipHash-1-3 (как у str в CPython) по байтам UTF-8.
+    
+    128-битный ключ выводится из 64-битного зерна; без знания зерна
+    подобрать коллизии нельзя.
+    
+    Временная сложность: O(n), где n - длина строки
+    """
+    k0 = seed & MASK64
+    k1 = (k0 * FIBONACCI_MULTIPLIER + 1) & MASK64
+    return _siphash(key.encode("utf-8"), k0, k1, 1, 3)
+
+
+def builtin_hash(key: str, seed: int = 0) -> int:
+    """
+    Встроенный hash(). Для строк он уже ключевой (SipHash со случайным
+    ключом процесса, см. PYTHONHASHSEED), поэтому зерно таблицы не используется.
+    
+    Временная сложность: O(n) при первом вызове, далее O(1) (хэш кэшируется в строке)
+    """
+    return hash(key) & MASK64
+
+
+HASH_FUNCTIONS = {
+    "djb2": djb2_hash,
+    "fnv1a": fnv1a_hash,
+    "siphash": siphash_hash,
+    "builtin": builtin_hash,
+}
+
+
+def resolve_hash_function(hash_function):
+    """
+    Хэш-функция по имени из HASH_FUNCTIONS или сама функция f(key, seed) -> int.
+    
+    Raises:
+        ValueError: Если имя неизвестно
+    """
+    if callable(hash_function):
+        return hash_function
+    try:
+        return HASH_FUNCTIONS[hash_function]
+    except KeyError:
+        raise ValueError(f"Неизвестная хэш-функция: {hash_function}") from None
+
+
+def _numpy_hashes(keys: list, hash_function, seed: int):
+    """
+    Векторизованный djb2 или FNV-1a для пакета ключей.
+    
+    Ключи кодируются в матрицу байтов n x (длина самого длинного ключа);
+    по столбцам хэши всех ключей обновляются одной операцией над uint64
+    (переполнение даёт нужное взятие по модулю 2^64), позиции за концом
+    ключа маскируются. djb2 работает с кодами символов, поэтому для него
+    подходят только ASCII-ключи.
+    
+    Returns:
+        Список хэшей или None, если пакет не подходит для NumPy
+    """
+    if hash_function is djb2_hash:
+        if not all(key.isascii() for key in keys):
+            return None
+        encoded = [key.encode("ascii") for key in keys]
+        initial = 5381 ^ seed
+    else:
+        encoded = [key.encode("utf-8") for key in keys]
+        initial = FNV_OFFSET_BASIS ^ seed
+    
+    count = len(encoded)
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=count)
+    width = int(lengths.max())
+    if width > NUMPY_MAX_KEY_LENGTH:
+        return None
+    hashes = np.full(count, initial, dtype=np.uint64)
+    if width == 0:
+        return hashes.tolist()
+    
+    matrix = np.array(encoded, dtype=f"S{width}").view(np.uint8).reshape(count, width)
+    multiplier = np.uint64(33 if hash_function is djb2_hash else FNV_PRIME)
+    for column in range(width):
+        byte = matrix[:, column].astype(np.uint64)
+        if hash_function is djb2_hash:
+            updated = hashes * multiplier + byte
+        else:
+            updated = (hashes ^ byte) * multiplier
+        hashes = np.where(column < lengths, updated, hashes)
+    return hashes.tolist()
+
+
+def new_counters() -> dict:
+    """Счётчики операций: количество и суммарные пробы для попаданий и промахов."""
+    return {"gets": 0, "puts": 0, "removes": 0,
+            "hits": 0, "misses": 0, "hit_probes": 0, "miss_probes": 0}
+
+
+def record_operation(counters: dict, operation: str, probes: int, hit: bool):
+    """Учёт одной операции с количеством проб."""
+    counters[operation] += 1
+    if hit:
+        counters["hits"] += 1
+        counters["hit_probes"] += probes
+    else:
+        counters["misses"] += 1
+        counters["miss_probes"] += probes
+
+
+def operation_stats(counters: dict):
+    """Счётчики операций со средними пробами (None, если счётчики выключены)."""
+    if counters is None:
+        return None
+    result = dict(counters)
+    result["avg_probes_hit"] = counters["hit_probes"] / counters["hits"] if counters["hits"] else 0.0
+    result["avg_probes_miss"] = (counters["miss_probes"] / counters["misses"]
+                                 if counters["misses"] else 0.0)
+    return result
+
+
+def chain_stats(buckets: list, size: int, capacity: int) -> dict:
+    """
+    Статистика цепочек: гистограмма длин корзин и ожидаемые пробы.
+    
+    Успешный поиск ключа на позиции j цепочки стоит j + 1 проб. Промах
+    проходит всю цепочку; ключ-промах считается распределённым так же,
+    как ключи таблицы, поэтому плохая хэш-функция видна и здесь.
+    
+    Временная сложность: O(capacity)
+    """
+    histogram = {}
+    longest = 0
+    hit_probes = 0
+    miss_probes = 0
+    for bucket in buckets:
+        length = len(bucket)
+        histogram[length] = histogram.get(length, 0) + 1
+        if length > longest:
+            longest = length
+        hit_probes += length * (length + 1) // 2
+        miss_probes += length * length
+    return {
+        "size": size,
+        "capacity": capacity,
+        "load_factor": size / capacity,
+        "bucket_histogram": dict(sorted(histogram.items())),
+        "max_chain": longest,
+        "avg_probes_hit": hit_probes / size if size else 0.0,
+        "avg_probes_miss": miss_probes / size if size else 0.0,
+    }
+
 
 class HashTable:
     """
     Хэш-таблица с методом разрешения коллизий через цепочки.
+    
+    В режиме incremental расширение не выполняется целиком в одном put:
+    старый и новый массивы корзин существуют одновременно, и каждая
+    операция переносит не более MIGRATE_BUCKETS старых корзин. Старая
+    корзина i при удвоении вместимости переходит ровно в новые корзины
+    i и i + старая вместимость; пока она не перенесена, эти новые
+    корзины равны None.
+    
+    Хэш-функция задаётся для каждой таблицы (см. HASH_FUNCTIONS) вместе
+    со случайным зерном, чтобы раскладка ключей по корзинам не была
+    известна заранее.
+    
+    Состояние таблицы возвращает stats(); с count_operations=True
+    таблица дополнительно считает операции и фактические пробы
+    (сравнения с элементами корзины).
     """
     
-    def __init__(self, capacity: int = 16):
+    MAX_LOAD_FACTOR = 0.75
+    MIGRATE_BUCKETS = 8
+    
+    def __init__(self, capacity: int = 16, incremental: bool = False,
+                 hash_function="djb2", seed: int = None, count_operations: bool = False):
         """
         Инициализация хэш-таблицы.
         
         Args:
             capacity: Начальная вместимость таблицы
+            incremental: Расширять таблицу постепенно (ограниченная задержка put)
+            hash_function: Имя из HASH_FUNCTIONS или функция f(key, seed) -> int
+            seed: Зерно хэш-функции (None - случайное для каждой таблицы)
+            count_operations: Вести счётчики операций и проб
         """
         self.capacity = capacity
         self.size = 0
         self.buckets = [[] for _ in range(capacity)]
+        self.incremental = incremental
+        self._old_buckets = None
+        self._migrate_index = 0
+        self.hash_function = resolve_hash_function(hash_function)
+        self.seed = secrets.randbits(64) if seed is None else seed
+        self.counters = new_counters() if count_operations else None
+        self.resizes = 0
+        self.resize_time = 0.0
     
     def _hash(self, key: str) -> int:
         """
-        Хэш-функция для строк (djb2 алгоритм).
+        Хэш-функция таблицы с её зерном.
+        
+        Возвращает полный 64-битный хэш (до взятия по модулю вместимости);
+        он хранится в элементе, чтобы при расширении не хэшировать ключ заново.
         
         Временная сложность: O(n), где n - длина строки
         
@@ -33,10 +316,7 @@ class HashTable:
         Returns:
             Хэш-значение
         """
-        hash_value = 5381
-        for char in key:
-            hash_value = ((hash_value << 5) + hash_value) + ord(char)
-        return hash_value % self.capacity
+        return self.hash_function(key, self.seed)
     
     def put(self, key: str, value):
         """
@@ -49,19 +329,32 @@ class HashTable:
             key: Ключ
             value: Значение
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self._bucket(hash_value)
         
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                bucket[i] = (key, value, hash_value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
                 return
         
-        bucket.append((key, value))
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        self._append(bucket, (key, value, hash_value))
+    
+    def _append(self, bucket: list, entry: tuple):
+        """Добавление нового элемента в корзину с расширением таблицы при необходимости."""
+        bucket.append(entry)
         self.size += 1
         
-        if self.size > self.capacity * 0.75:
-            self._resize()
+        if self.size > self.capacity * self.MAX_LOAD_FACTOR:
+            if self.incremental:
+                self._start_migration()
+            else:
+                self._resize()
     
     def get(self, key: str):
         """
@@ -75,13 +368,22 @@ class HashTable:
         Returns:
             Значение или None, если ключ не найден
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self.buckets[hash_value % self.capacity]
+        if bucket is None:
+            # Корзина ещё не перенесена - ключ ищется в старом массиве
+            bucket = self._old_buckets[hash_value % len(self._old_buckets)]
         
-        for k, v in bucket:
-            if k == key:
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
                 return v
         
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
         return None
     
     def remove(self, key: str) -> bool:
@@ -96,31 +398,380 @@ class HashTable:
         Returns:
             True если ключ был удален, False если не найден
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self._bucket(hash_value)
         
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
                 bucket.pop(i)
                 self.size -= 1
+                if self.counters is not None:
+                    record_operation(self.counters, "removes", i + 1, True)
                 return True
         
+        if self.counters is not None:
+            record_operation(self.counters, "removes", len(bucket), False)
         return False
     
-    def _resize(self):
+    def increment(self, key: str, delta=1):
+        """
+        Увеличение значения ключа на delta (отсутствующий ключ считается 0).
+        
+        Ключ хэшируется и ищется в корзине один раз.
+        
+        Временная сложность: O(1) в среднем случае
+        
+        Returns:
+            Новое значение
         """
-        Увеличение размера таблицы в 2 раза и перехеширование всех элементов.
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self._bucket(hash_value)
+        
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                value = v + delta
+                bucket[i] = (key, value, hash_value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        self._append(bucket, (key, delta, hash_value))
+        return delta
+    
+    def setdefault(self, key: str, default=None):
+        """
+        Значение ключа; если ключа нет - добавление default.
+        
+        Временная сложность: O(1) в среднем случае
+        
+        Returns:
+            Существующее значение или default
+        """
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self._bucket(hash_value)
+        
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
+                return v
+        
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
+        self._append(bucket, (key, default, hash_value))
+        return default
+    
+    def update_with(self, key: str, fn, default=None):
+        """
+        Замена значения ключа на fn(значение); для отсутствующего ключа
+        записывается fn(default).
+        
+        Временная сложность: O(1) в среднем случае (без учёта fn)
+        
+        Returns:
+            Новое значение
+        """
+        if self._old_buckets is not None:
+            self._migrate_step()
+        hash_value = self._hash(key)
+        bucket = self._bucket(hash_value)
+        
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                value = fn(v)
+                bucket[i] = (key, value, hash_value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        value = fn(default)
+        self._append(bucket, (key, value, hash_value))
+        return value
+    
+    def _hash_many(self, keys: list) -> list:
+        """
+        Полные хэши пакета ключей.
+        
+        Для djb2 и FNV-1a при установленном NumPy хэши считаются
+        векторизованно, иначе - в одном цикле без вызовов методов таблицы.
+        """
+        hash_function = self.hash_function
+        seed = self.seed
+        if (np is not None and len(keys) >= NUMPY_BATCH_MIN
+                and hash_function in (djb2_hash, fnv1a_hash)):
+            hashes = _numpy_hashes(keys, hash_function, seed)
+            if hashes is not None:
+                return hashes
+        return [hash_function(key, seed) for key in keys]
+    
+    def _bucket_order(self, hashes: list) -> list:
+        """
+        Позиции пакета, упорядоченные по номеру корзины.
+        
+        Сортировка устойчива, поэтому повторы одного ключа обрабатываются
+        в исходном порядке (побеждает последний put).
+        """
+        capacity = self.capacity
+        indexes = [hash_value % capacity for hash_value in hashes]
+        return sorted(range(len(hashes)), key=indexes.__getitem__)
+    
+    def put_many(self, pairs) -> int:
+        """
+        Пакетное добавление или обновление пар ключ-значение.
+        
+        Хэши считаются одним пакетом, таблица расширяется не более одного
+        раза (сразу до вместимости под весь пакет), вставка идёт по
+        корзинам в порядке их номеров.
+        
+        Временная сложность: O(k log k), где k - размер пакета
+        
+        Args:
+            pairs: Итерируемый объект пар (ключ, значение)
+            
+        Returns:
+            Количество добавленных (новых) ключей
+        """
+        pairs = list(pairs)
+        keys = [key for key, _ in pairs]
+        hashes = self._hash_many(keys)
+        self._finish_migration()
+        
+        capacity = self.capacity
+        while self.size + len(pairs) > capacity * self.MAX_LOAD_FACTOR:
+            capacity *= 2
+        if capacity != self.capacity:
+            self._resize(capacity)
+        
+        buckets = self.buckets
+        capacity = self.capacity
+        counters = self.counters
+        added = 0
+        for position in self._bucket_order(hashes):
+            key, value = pairs[position]
+            hash_value = hashes[position]
+            bucket = buckets[hash_value % capacity]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    bucket[i] = (key, value, hash_value)
+                    if counters is not None:
+                        record_operation(counters, "puts", i + 1, True)
+                    break
+            else:
+                if counters is not None:
+                    record_operation(counters, "puts", len(bucket), False)
+                bucket.append((key, value, hash_value))
+                added += 1
+        self.size += added
+        return added
+    
+    def get_many(self, keys) -> list:
+        """
+        Пакетное получение значений.
+        
+        Временная сложность: O(k log k), где k - размер пакета
+        
+        Args:
+            keys: Итерируемый объект ключей
+            
+        Returns:
+            Значения в порядке ключей (None для отсутствующих)
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        self._finish_migration()
+        
+        buckets = self.buckets
+        capacity = self.capacity
+        counters = self.counters
+        results = [None] * len(keys)
+        for position in self._bucket_order(hashes):
+            key = keys[position]
+            hash_value = hashes[position]
+            bucket = buckets[hash_value % capacity]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    results[position] = v
+                    if counters is not None:
+                        record_operation(counters, "gets", i + 1, True)
+                    break
+            else:
+                if counters is not None:
+                    record_operation(counters, "gets", len(bucket), False)
+        return results
+    
+    def remove_many(self, keys) -> int:
+        """
+        Пакетное удаление ключей.
+        
+        Временная сложность: O(k log k), где k - размер пакета
+        
+        Args:
+            keys: Итерируемый объект ключей
+            
+        Returns:
+            Количество удалённых ключей
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        self._finish_migration()
+        
+        buckets = self.buckets
+        capacity = self.capacity
+        counters = self.counters
+        removed = 0
+        for position in self._bucket_order(hashes):
+            key = keys[position]
+            hash_value = hashes[position]
+            bucket = buckets[hash_value % capacity]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    bucket.pop(i)
+                    removed += 1
+                    if counters is not None:
+                        record_operation(counters, "removes", i + 1, True)
+                    break
+            else:
+                if counters is not None:
+                    record_operation(counters, "removes", len(bucket), False)
+        self.size -= removed
+        return removed
+    
+    def _resize(self, capacity: int = None):
+        """
+        Увеличение размера таблицы (по умолчанию в 2 раза) и перераспределение элементов.
+        
+        Элементы переносятся по сохранённым хэшам как есть: ключи не
+        хэшируются заново, дубликаты не ищутся (ключи в таблице уникальны),
+        коэффициент заполнения не перепроверяется.
         
         Временная сложность: O(n), где n - количество элементов
+        
+        Args:
+            capacity: Новая вместимость (None - удвоенная текущая)
         """
+        self._finish_migration()
+        start_time = time.perf_counter()
         old_buckets = self.buckets
-        self.capacity *= 2
-        self.buckets = [[] for _ in range(self.capacity)]
-        self.size = 0
+        self.capacity = capacity or self.capacity * 2
+        capacity = self.capacity
+        buckets = [[] for _ in range(capacity)]
         
         for bucket in old_buckets:
-            for key, value in bucket:
-                self.put(key, value)
+            for entry in bucket:
+                buckets[entry[2] % capacity].append(entry)
+        self.buckets = buckets
+        self.resizes += 1
+        self.resize_time += time.perf_counter() - start_time
+    
+    def _bucket(self, hash_value: int) -> list:
+        """
+        Корзина ключа в текущем массиве.
+        
+        Если во время миграции корзина ещё не перенесена, соответствующая
+        старая корзина переносится сразу (O(длины цепочки)).
+        """
+        index = hash_value % self.capacity
+        bucket = self.buckets[index]
+        if bucket is None:
+            start_time = time.perf_counter()
+            self._migrate_bucket(index % len(self._old_buckets))
+            self.resize_time += time.perf_counter() - start_time
+            bucket = self.buckets[index]
+        return bucket
+    
+    def _start_migration(self):
+        """
+        Начало постепенного расширения: новый массив корзин в 2 раза больше.
+        
+        Новый массив заполняется None (один проход по памяти без создания
+        списков); сами корзины создаются при переносе.
+        
+        Временная сложность: O(n) с малой константой
+        """
+        self._finish_migration()
+        start_time = time.perf_counter()
+        self._old_buckets = self.buckets
+        self._migrate_index = 0
+        self.capacity *= 2
+        self.buckets = [None] * self.capacity
+        self.resizes += 1
+        self.resize_time += time.perf_counter() - start_time
+    
+    def _migrate_bucket(self, index: int):
+        """Перенос старой корзины index в новые корзины index и index + старая вместимость."""
+        old_buckets = self._old_buckets
+        capacity = self.capacity
+        low = []
+        high = []
+        for entry in old_buckets[index]:
+            if entry[2] % capacity == index:
+                low.append(entry)
+            else:
+                high.append(entry)
+        self.buckets[index] = low
+        self.buckets[index + len(old_buckets)] = high
+        old_buckets[index] = None
+    
+    def _migrate_step(self):
+        """
+        Перенос очередных MIGRATE_BUCKETS старых корзин.
+        
+        Временная сложность: O(MIGRATE_BUCKETS) в среднем случае
+        """
+        start_time = time.perf_counter()
+        old_buckets = self._old_buckets
+        start = self._migrate_index
+        end = min(start + self.MIGRATE_BUCKETS, len(old_buckets))
+        for index in range(start, end):
+            if old_buckets[index] is not None:
+                self._migrate_bucket(index)
+        self._migrate_index = end
+        if end == len(old_buckets):
+            self._old_buckets = None
+        self.resize_time += time.perf_counter() - start_time
+    
+    def _finish_migration(self):
+        """Завершение начатой миграции целиком."""
+        while self._old_buckets is not None:
+            self._migrate_step()
+    
+    def items(self):
+        """Возвращает все пары ключ-значение."""
+        for bucket in self.buckets:
+            if bucket:
+                for k, v, _ in bucket:
+                    yield (k, v)
+        if self._old_buckets is not None:
+            for bucket in self._old_buckets:
+                if bucket:
+                    for k, v, _ in bucket:
+                        yield (k, v)
+    
+    def stats(self) -> dict:
+        """
+        Статистика таблицы: заполнение, длины цепочек, ожидаемые пробы,
+        расширения и (если включены) счётчики операций.
+        
+        Временная сложность: O(capacity)
+        """
+        buckets = [bucket for bucket in self.buckets if bucket is not None]
+        if self._old_buckets is not None:
+            buckets.extend(bucket for bucket in self._old_buckets if bucket is not None)
+        result = chain_stats(buckets, self.size, self.capacity)
+        result["resizes"] = self.resizes
+        result["resize_time"] = self.resize_time
+        result["operations"] = operation_stats(self.counters)
+        return result
     
     def visualize(self):
         """
@@ -129,11 +780,772 @@ class HashTable:
         print(f"\n=== Состояние хэш-таблицы (размер: {self.size}, вместимость: {self.capacity}) ===")
         for i, bucket in enumerate(self.buckets):
             if bucket:
-                items = [f"{k}:{v}" for k, v in bucket]
+                items = [f"{k}:{v}" for k, v, _ in bucket]
                 print(f"Корзина {i:2d}: {' -> '.join(items)}")
+        if self._old_buckets is not None:
+            print(f"Миграция: перенесено {self._migrate_index} из {len(self._old_buckets)} корзин")
+            for i, bucket in enumerate(self._old_buckets):
+                if bucket:
+                    items = [f"{k}:{v}" for k, v, _ in bucket]
+                    print(f"Старая корзина {i:2d}: {' -> '.join(items)}")
         print()
 
 
+class OpenAddressingHashTable:
+    """
+    Хэш-таблица с открытой адресацией (линейное пробирование).
+    
+    Ключи, значения и полные хэши хранятся в трёх плоских параллельных
+    массивах (хэши - в array('Q') по 8 байт), без списка на корзину
+    и кортежа на элемент. Удаление выполняется обратным сдвигом
+    (backward-shift), поэтому «надгробия» не нужны. Сохранённые хэши
+    используются при расширении и сдвиге (ключи не хэшируются повторно);
+    при поиске строки сравниваются напрямую - это дешевле чтения хэша
+    из array. Вместимость - степень двойки, домашний слот - старшие биты
+    хэша (см. _hash): последовательные ключи вроде "key1", "key2" дают
+    у djb2 соседние значения и без перемешивания образуют длинные кластеры.
+    
+    Память на элемент в несколько раз меньше, чем у цепочек. Поиск
+    быстрее только при дешёвой хэш-функции (builtin, примерно в 1.5 раза):
+    с djb2 на чистом Python время поиска определяет само хэширование,
+    и скорость та же, что у цепочек (см. compare_open_addressing).
+    """
+    
+    MAX_LOAD_FACTOR = 0.75
+    
+    def __init__(self, capacity: int = 16, hash_function="djb2", seed: int = None):
+        """
+        Инициализация хэш-таблицы.
+        
+        Args:
+            capacity: Начальная вместимость (округляется вверх до степени двойки)
+            hash_function: Имя из HASH_FUNCTIONS или функция f(key, seed) -> int
+            seed: Зерно хэш-функции (None - случайное для каждой таблицы)
+        """
+        size = 8
+        while size < capacity:
+            size *= 2
+        self.capacity = size
+        self.size = 0
+        self.hash_function = resolve_hash_function(hash_function)
+        self.seed = secrets.randbits(64) if seed is None else seed
+        self._allocate(size)
+    
+    def _allocate(self, capacity: int):
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        self.hashes = array('Q', bytes(8 * capacity))
+    
+    def _hash(self, key: str) -> int:
+        """
+        Полный 64-битный хэш ключа: хэш-функция таблицы, перемешанная
+        умножением на FIBONACCI_MULTIPLIER (домашний слот - старшие биты).
+        
+        Временная сложность: O(n), где n - длина строки
+        """
+        return (self.hash_function(key, self.seed) * FIBONACCI_MULTIPLIER) & MASK64
+    
+    def _find(self, key: str, hash_value: int) -> int:
+        """
+        Поиск слота ключа.
+        
+        Returns:
+            Индекс слота или -1, если ключ не найден
+        """
+        keys = self.keys
+        mask = self.capacity - 1
+        index = hash_value >> self.shift
+        while True:
+            current = keys[index]
+            if current == key:
+                return index
+            if current is None:
+                return -1
+            index = (index + 1) & mask
+    
+    def put(self, key: str, value):
+        """
+        Добавление или обновление пары ключ-значение.
+        
+        Временная сложность: O(1) в среднем случае
+        """
+        if key is None:
+            raise TypeError("Ключ не может быть None")
+        hash_value = self._hash(key)
+        keys = self.keys
+        hashes = self.hashes
+        mask = self.capacity - 1
+        index = hash_value >> self.shift
+        while True:
+            current = keys[index]
+            if current == key:
+                self.values[index] = value
+                return
+            if current is None:
+                break
+            index = (index + 1) & mask
+        
+        keys[index] = key
+        self.values[index] = value
+        hashes[index] = hash_value
+        self.size += 1
+        
+        if self.size > self.capacity * self.MAX_LOAD_FACTOR:
+            self._resize()
+    
+    def get(self, key: str):
+        """
+        Получение значения по ключу.
+        
+        Временная сложность: O(1) в среднем случае
+        
+        Returns:
+            Значение или None, если ключ не найден
+        """
+        keys = self.keys
+        mask = self.capacity - 1
+        # _hash встроен: вызов метода заметен на фоне короткого пробирования
+        hash_value = (self.hash_function(key, self.seed) * FIBONACCI_MULTIPLIER) & MASK64
+        index = hash_value >> self.shift
+        while True:
+            current = keys[index]
+            if current == key:
+                return self.values[index]
+            if current is None:
+                return None
+            index = (index + 1) & mask
+    
+    def remove(self, key: str) -> bool:
+        """
+        Удаление пары ключ-значение с обратным сдвигом следующих элементов.
+        
+        Временная сложность: O(1) в среднем случае
+        
+        Returns:
+            True если ключ был удален, False если не найден
+        """
+        hole = self._find(key, self._hash(key))
+        if hole < 0:
+            return False
+        
+        keys = self.keys
+        values = self.values
+        hashes = self.hashes
+        mask = self.capacity - 1
+        shift = self.shift
+        index = hole
+        while True:
+            index = (index + 1) & mask
+            if keys[index] is None:
+                break
+            home = hashes[index] >> shift
+            # Элемент можно сдвинуть в «дыру», если его домашний слот
+            # не лежит циклически между дырой и текущей позицией
+            if ((index - home) & mask) >= ((index - hole) & mask):
+                keys[hole] = keys[index]
+                values[hole] = values[index]
+                hashes[hole] = hashes[index]
+                hole = index
+        
+        keys[hole] = None
+        values[hole] = None
+        hashes[hole] = 0
+        self.size -= 1
+        return True
+    
+    def _resize(self):
+        """
+        Увеличение размера таблицы в 2 раза.
+        
+        Используются сохранённые хэши, ключи заново не хэшируются.
+        
+        Временная сложность: O(n), где n - вместимость
+        """
+        old_keys = self.keys
+        old_values = self.values
+        old_hashes = self.hashes
+        self.capacity *= 2
+        self._allocate(self.capacity)
+        
+        keys = self.keys
+        values = self.values
+        hashes = self.hashes
+        mask = self.capacity - 1
+        shift = self.shift
+        for i, key in enumerate(old_keys):
+            if key is None:
+                continue
+            hash_value = old_hashes[i]
+            index = hash_value >> shift
+            while keys[index] is not None:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = old_values[i]
+            hashes[index] = hash_value
+    
+    def items(self):
+        """Возвращает все пары ключ-значение."""
+        for key, value in zip(self.keys, self.values):
+            if key is not None:
+                yield (key, value)
+    
+    def probe_stats(self) -> dict:
+        """
+        Статистика длин пробирования.
+        
+        Длина пробирования элемента - количество просмотренных слотов
+        при успешном поиске (1, если элемент лежит в домашнем слоте).
+        
+        Временная сложность: O(capacity)
+        """
+        mask = self.capacity - 1
+        total = 0
+        longest = 0
+        for index, key in enumerate(self.keys):
+            if key is None:
+                continue
+            home = self.hashes[index] >> self.shift
+            probes = ((index - home) & mask) + 1
+            total += probes
+            if probes > longest:
+                longest = probes
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "avg_probe_length": total / self.size if self.size else 0.0,
+            "max_probe_length": longest,
+        }
+    
+    def __len__(self):
+        return self.size
+
+
+class CuckooHashTable:
+    """
+    Кукушкина хэш-таблица: у каждого ключа ways возможных слотов.
+    
+    Ключ лежит в одном из своих слотов или в небольшом стэше, поэтому
+    поиск просматривает не более ways слотов и STASH_SIZE элементов
+    стэша независимо от заполнения. Вставка в занятые слоты вытесняет
+    случайного «жильца» в один из его других слотов (случайное блуждание
+    не длиннее MAX_KICKS). Элемент, которому не нашлось места, попадает
+    в стэш; при переполнении стэша таблица перестраивается с новыми
+    солями позиций (ключи заново не хэшируются - используются сохранённые
+    полные хэши), а если и это не помогает - с удвоенной вместимостью.
+    
+    Позиция i-го слота - старшие биты (hash ^ salt_i) * FIBONACCI_MULTIPLIER.
+    Все позиции вычисляются из одного полного хэша, поэтому ключи
+    с одинаковым полным хэшем (например, подобранные коллизии djb2)
+    конкурируют за одни и те же слоты. Поэтому по умолчанию используется
+    ключевая хэш-функция (siphash), а если новые соли не помогли, таблица
+    переходит на siphash с новым зерном и заново хэширует ключи. Стэш
+    никогда не превышает STASH_SIZE.
+    """
+    
+    MAX_LOAD_FACTOR = 0.85
+    MAX_KICKS = 500
+    STASH_SIZE = 8
+    REHASH_ATTEMPTS = 4
+    
+    def __init__(self, capacity: int = 16, ways: int = 3, hash_function="siphash",
+                 seed: int = None):
+        """
+        Инициализация хэш-таблицы.
+        
+        Args:
+            capacity: Начальная вместимость (округляется вверх до степени двойки)
+            ways: Количество хэш-функций (слотов на ключ), не меньше 2
+            hash_function: Имя из HASH_FUNCTIONS или функция f(key, seed) -> int
+            seed: Зерно хэш-функции (None - случайное для каждой таблицы)
+        """
+        if ways < 2:
+            raise ValueError("Количество хэш-функций должно быть не меньше 2")
+        size = 8
+        while size < capacity:
+            size *= 2
+        self.ways = ways
+        self.size = 0
+        self.rehashes = 0
+        self.hash_function = resolve_hash_function(hash_function)
+        self.seed = secrets.randbits(64) if seed is None else seed
+        self._random = random.Random(self.seed)
+        self.stash = []
+        self._allocate(size)
+    
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.salts = [self._random.getrandbits(64) for _ in range(self.ways)]
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+        self.hashes = array('Q', bytes(8 * capacity))
+    
+    def _hash(self, key: str) -> int:
+        """Полный 64-битный хэш ключа."""
+        return self.hash_function(key, self.seed)
+    
+    def _positions(self, hash_value: int) -> list:
+        """Все возможные слоты ключа."""
+        shift = self.shift
+        return [(((hash_value ^ salt) * FIBONACCI_MULTIPLIER) & MASK64) >> shift
+                for salt in self.salts]
+    
+    def _find(self, key: str, hash_value: int) -> int:
+        """
+        Поиск слота ключа (без стэша).
+        
+        Returns:
+            Индекс слота или -1, если ключ не в основном массиве
+        """
+        keys = self.keys
+        for index in self._positions(hash_value):
+            if keys[index] == key:
+                return index
+        return -1
+    
+    def put(self, key: str, value):
+        """
+        Добавление или обновление пары ключ-значение.
+        
+        Амортизированная временная сложность: O(1) в среднем случае
+        
+        Args:
+            key: Ключ
+            value: Значение
+        """
+        hash_value = self._hash(key)
+        index = self._find(key, hash_value)
+        if index >= 0:
+            self.values[index] = value
+            return
+        stash = self.stash
+        for i, (k, v, h) in enumerate(stash):
+            if h == hash_value and k == key:
+                stash[i] = (key, value, hash_value)
+                return
+        
+        if self.size + 1 > self.capacity * self.MAX_LOAD_FACTOR:
+            self._rebuild(self.capacity * 2)
+        self.size += 1
+        homeless = self._place(key, value, hash_value)
+        if homeless is not None:
+            self.stash.append(homeless)
+            if len(self.stash) > self.STASH_SIZE:
+                self._rebuild(self.capacity)
+    
+    def _place(self, key: str, value, hash_value: int):
+        """
+        Размещение элемента с вытеснением жильцов.
+        
+        Returns:
+            None или элемент (key, value, hash), которому не нашлось места
+            (не обязательно исходный)
+        """
+        keys = self.keys
+        values = self.values
+        hashes = self.hashes
+        rng = self._random
+        last = -1
+        for _ in range(self.MAX_KICKS):
+            positions = self._positions(hash_value)
+            for index in positions:
+                if keys[index] is None:
+                    keys[index] = key
+                    values[index] = value
+                    hashes[index] = hash_value
+                    return None
+            # Не возвращаем только что вытеснивший нас элемент на его место
+            candidates = [index for index in positions if index != last] or positions
+            index = candidates[rng.randrange(len(candidates))]
+            key, keys[index] = keys[index], key
+            value, values[index] = values[index], value
+            hash_value, hashes[index] = hashes[index], hash_value
+            last = index
+        return (key, value, hash_value)
+    
+    def _rebuild(self, capacity: int):
+        """
+        Перестройка таблицы с новыми солями позиций по сохранённым хэшам.
+        
+        После REHASH_ATTEMPTS - 1 неудачных попыток вместимость удваивается,
+        если таблица заполнена больше чем наполовину. Если не помогает и это
+        (много ключей с одинаковым полным хэшем), таблица переходит на
+        siphash с новым случайным зерном, ключи хэшируются заново,
+        и попытки повторяются - вместимость не растёт без пользы.
+        
+        Временная сложность: O(n) в среднем случае
+        """
+        entries = list(self.stash)
+        for index, key in enumerate(self.keys):
+            if key is not None:
+                entries.append((key, self.values[index], self.hashes[index]))
+        
+        while True:
+            for attempt in range(self.REHASH_ATTEMPTS):
+                if attempt == self.REHASH_ATTEMPTS - 1 and len(entries) > capacity // 2:
+                    capacity *= 2
+                self._allocate(capacity)
+                stash = []
+                for key, value, hash_value in entries:
+                    homeless = self._place(key, value, hash_value)
+                    if homeless is not None:
+                        stash.append(homeless)
+                if len(stash) <= self.STASH_SIZE:
+                    self.stash = stash
+                    self.rehashes += 1
+                    return
+            
+            self.hash_function = siphash_hash
+            self.seed = secrets.randbits(64)
+            entries = [(key, value, self._hash(key)) for key, value, _ in entries]
+    
+    def get(self, key: str):
+        """
+        Получение значения по ключу.
+        
+        Временная сложность: O(ways + STASH_SIZE) в худшем случае
+        
+        Args:
+            key: Ключ
+            
+        Returns:
+            Значение или None, если ключ не найден
+        """
+        hash_value = self._hash(key)
+        keys = self.keys
+        shift = self.shift
+        for salt in self.salts:
+            index = (((hash_value ^ salt) * FIBONACCI_MULTIPLIER) & MASK64) >> shift
+            if keys[index] == key:
+                return self.values[index]
+        for k, v, h in self.stash:
+            if h == hash_value and k == key:
+                return v
+        return None
+    
+    def remove(self, key: str) -> bool:
+        """
+        Удаление пары ключ-значение (слот просто освобождается).
+        
+        Временная сложность: O(ways + STASH_SIZE) в худшем случае
+        
+        Args:
+            key: Ключ
+            
+        Returns:
+            True если ключ был удален, False если не найден
+        """
+        hash_value = self._hash(key)
+        index = self._find(key, hash_value)
+        if index >= 0:
+            self.keys[index] = None
+            self.values[index] = None
+            self.size -= 1
+            return True
+        for i, (k, v, h) in enumerate(self.stash):
+            if h == hash_value and k == key:
+                self.stash.pop(i)
+                self.size -= 1
+                return True
+        return False
+    
+    def items(self):
+        """Возвращает все пары ключ-значение."""
+        for key, value in zip(self.keys, self.values):
+            if key is not None:
+                yield (key, value)
+        for key, value, _ in self.stash:
+            yield (key, value)
+    
+    def probe_stats(self) -> dict:
+        """
+        Статистика таблицы: заполнение, стэш и наибольшее число проб поиска.
+        
+        Временная сложность: O(1)
+        """
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "stash_size": len(self.stash),
+            "rehashes": self.rehashes,
+            "max_probe_length": self.ways + len(self.stash),
+        }
+    
+    def __len__(self):
+        return self.size
+
+
+def _structure_size(table) -> int:
+    """
+    Память, занимаемая структурой таблицы (без самих ключей и значений).
+    """
+    if isinstance(table, OpenAddressingHashTable):
+        return (sys.getsizeof(table.keys) + sys.getsizeof(table.values)
+                + sys.getsizeof(table.hashes))
+    total = sys.getsizeof(table.buckets)
+    for bucket in table.buckets:
+        total += sys.getsizeof(bucket)
+        for entry in bucket:
+            total += sys.getsizeof(entry)
+    return total
+
+
+def compare_open_addressing(n: int = 100000):
+    """
+    Сравнение цепочек и открытой адресации по памяти на элемент
+    и скорости поиска.
+    """
+    keys = [f"key{i}" for i in range(n)]
+    
+    print("=== Сравнение цепочек и открытой адресации ===")
+    print(f"Количество ключей: {n}")
+    
+    # С djb2 на чистом Python время поиска определяет хэширование,
+    # с builtin видна разница самих структур
+    for hash_function in ("djb2", "builtin"):
+        print(f"\nХэш-функция {hash_function}:")
+        get_times = {}
+        for table_class in (HashTable, OpenAddressingHashTable):
+            table = table_class(hash_function=hash_function)
+            start_time = time.time()
+            for i, key in enumerate(keys):
+                table.put(key, i)
+            put_time = time.time() - start_time
+            
+            start_time = time.time()
+            for key in keys:
+                table.get(key)
+            get_time = time.time() - start_time
+            get_times[table_class] = get_time
+            
+            print(f"  {table_class.__name__}: put: {put_time:.4f} сек, get: {get_time:.4f} сек "
+                  f"({n / get_time:,.0f} поисков/сек), "
+                  f"память структуры: {_structure_size(table) / n:.1f} байт на элемент")
+        print(f"  Ускорение поиска: "
+              f"{get_times[HashTable] / get_times[OpenAddressingHashTable]:.2f}x")
+    
+    print(f"\nСтатистика пробирования: {table.probe_stats()}")
+
+
+def compare_resize(n: int = 200000):
+    """
+    Сравнение стоимости расширения HashTable: перераспределение
+    по сохранённым хэшам против повторной вставки через put.
+    """
+    keys = [f"key{i}" for i in range(n)]
+    # Вместимость, при которой n элементов ещё не вызывают расширения
+    capacity = int(n / 0.75) + 1
+    
+    print("=== Сравнение стоимости расширения HashTable ===")
+    print(f"Количество элементов: {n}")
+    
+    table = HashTable(capacity)
+    for i, key in enumerate(keys):
+        table.put(key, i)
+    
+    # Прежний способ: каждый элемент заново хэшируется и вставляется через put
+    start_time = time.time()
+    rebuilt = HashTable(capacity * 2)
+    for bucket in table.buckets:
+        for key, value, _ in bucket:
+            rebuilt.put(key, value)
+    reput_time = time.time() - start_time
+    print(f"Повторная вставка через put: {reput_time:.4f} сек")
+    
+    start_time = time.time()
+    table._resize()
+    resize_time = time.time() - start_time
+    print(f"Перераспределение по сохранённым хэшам: {resize_time:.4f} сек")
+    
+    print(f"Значения сохранены: {all(table.get(key) == i for i, key in enumerate(keys))}")
+    print(f"\nУскорение: {reput_time / resize_time:.2f}x")
+
+
+def _latency_histogram(latencies: list) -> dict:
+    """
+    Гистограмма задержек (в секундах) по порогам 1 мкс - 10 мс и перцентили.
+    """
+    ordered = sorted(latencies)
+    thresholds = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2]
+    labels = ["<1мкс", "<10мкс", "<100мкс", "<1мс", "<10мс", ">=10мс"]
+    counts = [0] * len(labels)
+    for latency in ordered:
+        slot = 0
+        while slot < len(thresholds) and latency >= thresholds[slot]:
+            slot += 1
+        counts[slot] += 1
+    
+    def percentile(p):
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+    
+    return {
+        "histogram": dict(zip(labels, counts)),
+        "p50": percentile(0.50),
+        "p99": percentile(0.99),
+        "p999": percentile(0.999),
+        "max": ordered[-1],
+    }
+
+
+def compare_incremental_resize(n: int = 300000):
+    """
+    Сравнение задержек отдельных put при полном и постепенном расширении.
+    
+    Каждый put замеряется time.perf_counter; при полном расширении
+    худший put переносит всю таблицу, при постепенном - ограничен.
+    """
+    keys = [f"key{i}" for i in range(n)]
+    
+    print("=== Задержка put: полное и постепенное расширение ===")
+    print(f"Количество вставок: {n}")
+    
+    timer = time.perf_counter
+    for incremental in (False, True):
+        table = HashTable(incremental=incremental)
+        latencies = [0.0] * n
+        # Паузы сборщика мусора не относятся к расширению и скрыли бы разницу
+        gc.disable()
+        start_time = time.time()
+        for i, key in enumerate(keys):
+            started = timer()
+            table.put(key, i)
+            latencies[i] = timer() - started
+        total_time = time.time() - start_time
+        gc.enable()
+        
+        report = _latency_histogram(latencies)
+        mode = "постепенное" if incremental else "полное"
+        print(f"\nРасширение {mode}: всего {total_time:.4f} сек")
+        print(f"  Гистограмма: {report['histogram']}")
+        print(f"  p50: {report['p50'] * 1e6:.1f} мкс, p99: {report['p99'] * 1e6:.1f} мкс, "
+              f"p99.9: {report['p999'] * 1e6:.1f} мкс, max: {report['max'] * 1e3:.3f} мс")
+        print(f"  Значения сохранены: {all(table.get(key) == i for i, key in enumerate(keys))}")
+
+
+def djb2_collisions(blocks: int) -> list:
+    """
+    2^blocks разных строк с одинаковым хэшем djb2 при любом зерне.
+    
+    Блоки "Ab" и "BA" дают одинаковый вклад: 33 * 65 + 98 == 33 * 66 + 65,
+    поэтому любые их конкатенации одной длины сталкиваются.
+    """
+    keys = [""]
+    for _ in range(blocks):
+        keys = [key + block for key in keys for block in ("Ab", "BA")]
+    return keys
+
+
+def compare_adversarial_keys(blocks: int = 11):
+    """
+    Вставка и поиск подобранных коллизий djb2 для каждой хэш-функции:
+    максимальная длина цепочки и пропускная способность.
+    """
+    keys = djb2_collisions(blocks)
+    
+    print("=== Подобранные коллизии djb2 ===")
+    print(f"Количество ключей: {len(keys)} (длина {2 * blocks} символов)")
+    
+    for name in HASH_FUNCTIONS:
+        table = HashTable(hash_function=name)
+        start_time = time.time()
+        for i, key in enumerate(keys):
+            table.put(key, i)
+        for key in keys:
+            table.get(key)
+        elapsed = time.time() - start_time
+        
+        print(f"{name:8s}: {elapsed:.4f} сек, {2 * len(keys) / elapsed:,.0f} операций/сек, "
+              f"максимальная цепочка: {table.stats()['max_chain']}")
+
+
+def compare_lookup_tail_latency(capacity: int = 1 << 15, loads=(0.5, 0.6, 0.7, 0.8, 0.9)):
+    """
+    Хвостовые задержки успешного поиска у цепочек, открытой адресации
+    и кукушкиной таблицы при заданном заполнении.
+    
+    Расширение отключено (MAX_LOAD_FACTOR = 1), чтобы таблицы
+    работали именно при заданном коэффициенте заполнения.
+    """
+    timer = time.perf_counter
+    
+    print("=== Хвостовые задержки поиска при разном заполнении ===")
+    print(f"Вместимость: {capacity}")
+    
+    for load in loads:
+        n = int(capacity * load)
+        keys = [f"key{i}" for i in range(n)]
+        print(f"\nЗаполнение {load:.0%} ({n} ключей):")
+        for table_class in (HashTable, OpenAddressingHashTable, CuckooHashTable):
+            # Ключи не подобраны, поэтому у всех таблиц одна быстрая хэш-функция
+            table = table_class(capacity, hash_function="djb2")
+            table.MAX_LOAD_FACTOR = 1.0
+            for i, key in enumerate(keys):
+                table.put(key, i)
+            
+            latencies = [0.0] * n
+            gc.disable()
+            for i, key in enumerate(keys):
+                started = timer()
+                table.get(key)
+                latencies[i] = timer() - started
+            gc.enable()
+            
+            report = _latency_histogram(latencies)
+            if isinstance(table, HashTable):
+                probes = table.stats()["max_chain"]
+            else:
+                probes = table.probe_stats()["max_probe_length"]
+            print(f"  {table_class.__name__:24s} p50: {report['p50'] * 1e6:5.2f} мкс, "
+                  f"p99: {report['p99'] * 1e6:5.2f} мкс, p99.9: {report['p999'] * 1e6:6.2f} мкс, "
+                  f"max: {report['max'] * 1e6:7.1f} мкс, наибольшее число проб: {probes}")
+
+
+def compare_batch_operations(n: int = 200000):
+    """
+    Сравнение пакетных put_many/get_many/remove_many с циклом
+    одиночных вызовов put/get/remove.
+    """
+    keys = [f"key{i}" for i in range(n)]
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    
+    print("=== Сравнение пакетных и одиночных операций ===")
+    print(f"Количество ключей: {n}, NumPy: {'да' if np is not None else 'нет'}")
+    
+    scalar = HashTable()
+    start_time = time.time()
+    for key, value in pairs:
+        scalar.put(key, value)
+    put_time = time.time() - start_time
+    start_time = time.time()
+    scalar_values = [scalar.get(key) for key in keys]
+    get_time = time.time() - start_time
+    start_time = time.time()
+    for key in keys:
+        scalar.remove(key)
+    remove_time = time.time() - start_time
+    
+    batch = HashTable()
+    start_time = time.time()
+    batch.put_many(pairs)
+    put_many_time = time.time() - start_time
+    start_time = time.time()
+    batch_values = batch.get_many(keys)
+    get_many_time = time.time() - start_time
+    start_time = time.time()
+    batch.remove_many(keys)
+    remove_many_time = time.time() - start_time
+    
+    print(f"Результаты совпадают: {batch_values == scalar_values and len(batch_values) == n}")
+    for name, scalar_time, batch_time in (("put", put_time, put_many_time),
+                                          ("get", get_time, get_many_time),
+                                          ("remove", remove_time, remove_many_time)):
+        print(f"{name}: одиночные {scalar_time:.4f} сек, пакет {batch_time:.4f} сек, "
+              f"ускорение: {scalar_time / batch_time:.2f}x")
+
+
 if __name__ == "__main__":
     ht = HashTable(capacity=8)
     
@@ -160,9 +1572,64 @@ if __name__ == "__main__":
     ht.visualize()
     
     print("Добавление больше элементов...")
-    for i in range(10):
-        ht.put(f"key{i}", i)
+    ht.put_many((f"key{i}", i) for i in range(10))
+    print(f"get_many(['key3', 'key7', 'nonexistent']) = {ht.get_many(['key3', 'key7', 'nonexistent'])}")
     
     ht.visualize()
-
-
+    
+    stats = ht.stats()
+    print(f"Статистика: заполнение {stats['load_factor']:.2f}, "
+          f"длины корзин {stats['bucket_histogram']}, расширений: {stats['resizes']}")
+    
+    print("\n=== Тестирование постепенного расширения ===")
+    inc = HashTable(capacity=8, incremental=True)
+    for i, word in enumerate(["apple", "banana", "cherry", "date", "elderberry", "fig", "grape"]):
+        inc.put(word, i + 1)
+    inc.visualize()
+    print(f"get('apple') = {inc.get('apple')}, get('grape') = {inc.get('grape')}")
+    print(f"increment('apple', 5) = {inc.increment('apple', 5)}, "
+          f"setdefault('kiwi', 0) = {inc.setdefault('kiwi', 0)}, "
+          f"update_with('fig', lambda v: v * 10, 0) = {inc.update_with('fig', lambda v: v * 10, 0)}")
+    
+    print("=== Тестирование открытой адресации ===")
+    oa = OpenAddressingHashTable(capacity=8)
+    for i, word in enumerate(["apple", "banana", "cherry", "date", "elderberry"]):
+        oa.put(word, i + 1)
+    print(f"get('cherry') = {oa.get('cherry')}")
+    oa.remove("banana")
+    print(f"После remove('banana'): get('banana') = {oa.get('banana')}, "
+          f"get('date') = {oa.get('date')}")
+    print(f"Элементы: {sorted(oa.items())}")
+    print(f"Статистика: {oa.probe_stats()}")
+    
+    print("\n=== Тестирование кукушкиной хэш-таблицы ===")
+    cuckoo = CuckooHashTable(capacity=8)
+    for i, word in enumerate(["apple", "banana", "cherry", "date", "elderberry", "fig", "grape"]):
+        cuckoo.put(word, i + 1)
+    cuckoo.remove("banana")
+    print(f"get('cherry') = {cuckoo.get('cherry')}, get('banana') = {cuckoo.get('banana')}")
+    print(f"Статистика: {cuckoo.probe_stats()}")
+    
+    cuckoo = CuckooHashTable(hash_function="djb2")
+    for i, key in enumerate(djb2_collisions(8)):
+        cuckoo.put(key, i)
+    print(f"256 коллизий djb2: хэш-функция {cuckoo.hash_function.__name__}, "
+          f"статистика: {cuckoo.probe_stats()}")
+    
+    print()
+    compare_open_addressing()
+    
+    print()
+    compare_resize()
+    
+    print()
+    compare_incremental_resize()
+    
+    print()
+    compare_adversarial_keys()
+    
+    print()
+    compare_lookup_tail_latency()
+    
+    print()
+    compare_batch_operations()
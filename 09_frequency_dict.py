@@ -5,9 +5,39 @@
 Сравнение времени построения при плохой и хорошей хэш-функции.
 """
 
+import os
 import time
 import re
+import codecs
+import importlib.util
+import sys
+import tempfile
+import tracemalloc
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+spec = importlib.util.spec_from_file_location("hash_table_module", "08_hash_table.py")
+hash_table_module = importlib.util.module_from_spec(spec)
+sys.modules["hash_table_module"] = hash_table_module
+spec.loader.exec_module(hash_table_module)
+new_counters = hash_table_module.new_counters
+record_operation = hash_table_module.record_operation
+operation_stats = hash_table_module.operation_stats
+chain_stats = hash_table_module.chain_stats
+
+spec = importlib.util.spec_from_file_location("heap_module", "15_heap.py")
+heap_module = importlib.util.module_from_spec(spec)
+sys.modules["heap_module"] = heap_module
+spec.loader.exec_module(heap_module)
+MinHeap = heap_module.MinHeap
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+# Символы слов в начале строки: применяется к перевёрнутому концу порции,
+# чтобы найти хвост, который может быть началом разрезанного слова
+LEADING_WORD = re.compile(r'\w*')
+# Байт ASCII, не входящий в слова (не буква, не цифра и не "_"):
+# граница после него не разрезает ни слово, ни символ UTF-8
+SEPARATOR_BYTE = re.compile(rb'[\x00-\x2f\x3a-\x40\x5b-\x5e\x60\x7b-\x7f]')
 
 
 class BadHashTable:
@@ -15,10 +45,13 @@ class BadHashTable:
     Хэш-таблица с плохой хэш-функцией (всегда возвращает 1).
     """
     
-    def __init__(self, capacity: int = 16):
+    def __init__(self, capacity: int = 16, count_operations: bool = False):
         self.capacity = capacity
         self.size = 0
         self.buckets = [[] for _ in range(capacity)]
+        self.counters = new_counters() if count_operations else None
+        self.resizes = 0
+        self.resize_time = 0.0
     
     def _hash(self, key: str) -> int:
         """Плохая хэш-функция - всегда возвращает 1."""
@@ -31,8 +64,12 @@ class BadHashTable:
         for i, (k, v) in enumerate(bucket):
             if k == key:
                 bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
                 return
         
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
         bucket.append((key, value))
         self.size += 1
     
@@ -40,17 +77,82 @@ class BadHashTable:
         index = self._hash(key)
         bucket = self.buckets[index]
         
-        for k, v in bucket:
+        for i, (k, v) in enumerate(bucket):
             if k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
                 return v
         
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
         return None
     
+    def increment(self, key: str, delta=1):
+        """Увеличение значения на delta за один поиск в корзине (нет ключа - 0)."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                value = v + delta
+                bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        bucket.append((key, delta))
+        self.size += 1
+        return delta
+    
+    def setdefault(self, key: str, default=None):
+        """Значение ключа; если ключа нет - добавление default."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
+                return v
+        
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
+        bucket.append((key, default))
+        self.size += 1
+        return default
+    
+    def update_with(self, key: str, fn, default=None):
+        """Замена значения на fn(значение), для нового ключа - fn(default)."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                value = fn(v)
+                bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        value = fn(default)
+        bucket.append((key, value))
+        self.size += 1
+        return value
+    
     def items(self):
         """Возвращает все пары ключ-значение."""
         for bucket in self.buckets:
             for k, v in bucket:
                 yield (k, v)
+    
+    def stats(self) -> dict:
+        """Статистика таблицы в формате HashTable.stats() (таблица не расширяется)."""
+        result = chain_stats(self.buckets, self.size, self.capacity)
+        result["resizes"] = self.resizes
+        result["resize_time"] = self.resize_time
+        result["operations"] = operation_stats(self.counters)
+        return result
 
 
 class GoodHashTable:
@@ -58,10 +160,13 @@ class GoodHashTable:
     Хэш-таблица с хорошей хэш-функцией (djb2).
     """
     
-    def __init__(self, capacity: int = 16):
+    def __init__(self, capacity: int = 16, count_operations: bool = False):
         self.capacity = capacity
         self.size = 0
         self.buckets = [[] for _ in range(capacity)]
+        self.counters = new_counters() if count_operations else None
+        self.resizes = 0
+        self.resize_time = 0.0
     
     def _hash(self, key: str) -> int:
         """Хорошая хэш-функция djb2."""
@@ -77,8 +182,12 @@ class GoodHashTable:
         for i, (k, v) in enumerate(bucket):
             if k == key:
                 bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
                 return
         
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
         bucket.append((key, value))
         self.size += 1
     
@@ -86,55 +195,391 @@ class GoodHashTable:
         index = self._hash(key)
         bucket = self.buckets[index]
         
-        for k, v in bucket:
+        for i, (k, v) in enumerate(bucket):
             if k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
                 return v
         
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
         return None
     
+    def increment(self, key: str, delta=1):
+        """Увеличение значения на delta за один поиск в корзине (нет ключа - 0)."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                value = v + delta
+                bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        bucket.append((key, delta))
+        self.size += 1
+        return delta
+    
+    def setdefault(self, key: str, default=None):
+        """Значение ключа; если ключа нет - добавление default."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                if self.counters is not None:
+                    record_operation(self.counters, "gets", i + 1, True)
+                return v
+        
+        if self.counters is not None:
+            record_operation(self.counters, "gets", len(bucket), False)
+        bucket.append((key, default))
+        self.size += 1
+        return default
+    
+    def update_with(self, key: str, fn, default=None):
+        """Замена значения на fn(значение), для нового ключа - fn(default)."""
+        bucket = self.buckets[self._hash(key)]
+        
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                value = fn(v)
+                bucket[i] = (key, value)
+                if self.counters is not None:
+                    record_operation(self.counters, "puts", i + 1, True)
+                return value
+        
+        if self.counters is not None:
+            record_operation(self.counters, "puts", len(bucket), False)
+        value = fn(default)
+        bucket.append((key, value))
+        self.size += 1
+        return value
+    
     def items(self):
         """Возвращает все пары ключ-значение."""
         for bucket in self.buckets:
             for k, v in bucket:
                 yield (k, v)
+    
+    def stats(self) -> dict:
+        """Статистика таблицы в формате HashTable.stats() (таблица не расширяется)."""
+        result = chain_stats(self.buckets, self.size, self.capacity)
+        result["resizes"] = self.resizes
+        result["resize_time"] = self.resize_time
+        result["operations"] = operation_stats(self.counters)
+        return result
 
 
-def build_frequency_dict(text: str, hash_table_class):
+def build_frequency_dict(text: str, hash_table_class, count_operations: bool = False):
     """
     Построение частотного словаря с использованием заданной хэш-таблицы.
     
     Args:
         text: Текст для анализа
         hash_table_class: Класс хэш-таблицы (BadHashTable или GoodHashTable)
+        count_operations: Включить счётчики операций таблицы
         
     Returns:
         Хэш-таблица с частотами слов
     """
-    words = re.findall(r'\b\w+\b', text.lower())
+    words = WORD_PATTERN.findall(text.lower())
     
-    freq_dict = hash_table_class(capacity=1000)
+    freq_dict = hash_table_class(capacity=1000, count_operations=count_operations)
     
     for word in words:
-        current_count = freq_dict.get(word) or 0
-        freq_dict.put(word, current_count + 1)
+        freq_dict.increment(word)
+    
+    return freq_dict
+
+
+def iter_word_chunks(path: str, chunk_size: int = 1 << 20):
+    """
+    Ленивый разбор файла на слова (в нижнем регистре) по порциям.
+    
+    Порция режется по последнему символу-разделителю: хвост из букв
+    может быть началом слова, продолжающегося в следующей порции,
+    поэтому он переносится и склеивается с ней. В памяти одновременно
+    находятся одна порция и слова из неё.
+    
+    Args:
+        path: Путь к текстовому файлу (UTF-8)
+        chunk_size: Размер порции в символах
+        
+    Yields:
+        Списки слов очередной порции в порядке появления в файле
+    """
+    with open(path, encoding="utf-8") as file:
+        yield from _split_words(iter(lambda: file.read(chunk_size), ""))
+
+
+def _trailing_word_length(text: str) -> int:
+    """
+    Длина хвоста text из символов слов.
+    
+    Конец строки просматривается окнами удваивающейся длины,
+    поэтому время пропорционально длине хвоста, а не строки.
+    """
+    window = 64
+    while True:
+        tail = text[-window:]
+        length = LEADING_WORD.match(tail[::-1]).end()
+        if length < len(tail) or len(tail) == len(text):
+            return length
+        window *= 2
+
+
+def _split_words(chunks):
+    """
+    Слова из последовательности текстовых порций с переносом разрезанного хвоста.
+    
+    Порция целиком из символов слов только добавляется к переносу,
+    поэтому длинное слово на много порций не копируется повторно.
+    """
+    carry = []
+    for chunk in chunks:
+        cut = len(chunk) - _trailing_word_length(chunk)
+        if cut == 0:
+            carry.append(chunk)
+            continue
+        carry.append(chunk[:cut])
+        yield WORD_PATTERN.findall("".join(carry).lower())
+        carry = [chunk[cut:]]
+    yield WORD_PATTERN.findall("".join(carry).lower())
+
+
+def iter_words(path: str, chunk_size: int = 1 << 20):
+    """Слова файла по одному (см. iter_word_chunks)."""
+    for words in iter_word_chunks(path, chunk_size):
+        yield from words
+
+
+def build_frequency_dict_from_file(path: str, hash_table_class, chunk_size: int = 1 << 20,
+                                   count_operations: bool = False):
+    """
+    Построение частотного словаря по файлу без загрузки файла в память.
+    
+    Результат совпадает с build_frequency_dict для содержимого файла,
+    а память пропорциональна размеру словаря и порции, а не файла.
+    
+    Args:
+        path: Путь к текстовому файлу (UTF-8)
+        hash_table_class: Класс хэш-таблицы (BadHashTable или GoodHashTable)
+        chunk_size: Размер порции в символах
+        count_operations: Включить счётчики операций таблицы
+        
+    Returns:
+        Хэш-таблица с частотами слов
+    """
+    freq_dict = hash_table_class(capacity=1000, count_operations=count_operations)
+    
+    # Слова берутся списками по порциям: обход списка дешевле
+    # возобновления генератора на каждом слове
+    for words in iter_word_chunks(path, chunk_size):
+        for word in words:
+            freq_dict.increment(word)
+    
+    return freq_dict
+
+
+def partition_file(path: str, parts: int) -> list:
+    """
+    Разбиение файла на parts диапазонов байтов по границам слов.
+    
+    Номинальная граница сдвигается вперёд до позиции после ближайшего
+    байта-разделителя SEPARATOR_BYTE, поэтому ни одно слово и ни один
+    многобайтовый символ не попадает в два диапазона.
+    
+    Временная сложность: O(parts * длины сдвига)
+    
+    Returns:
+        Список пар (начало, конец), покрывающих файл без пропусков
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as file:
+        for part in range(1, parts):
+            position = max(size * part // parts, boundaries[-1])
+            file.seek(position)
+            while True:
+                block = file.read(1 << 16)
+                if not block:
+                    position = size
+                    break
+                match = SEPARATOR_BYTE.search(block)
+                if match:
+                    position += match.end()
+                    break
+                position += len(block)
+            boundaries.append(position)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _read_range(path: str, start: int, end: int, chunk_size: int):
+    """Текстовые порции диапазона байтов [start, end) файла в UTF-8."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def _count_range_into(freq_dict, path: str, start: int, end: int, chunk_size: int):
+    """Подсчёт слов диапазона байтов [start, end) файла в freq_dict."""
+    for words in _split_words(_read_range(path, start, end, chunk_size)):
+        for word in words:
+            freq_dict.increment(word)
+
+
+def count_range(path: str, start: int, end: int, hash_table_class, chunk_size: int = 1 << 20):
+    """
+    Частоты слов диапазона байтов файла (задача процесса-исполнителя).
+    
+    Подсчёт ведётся в хэш-таблице hash_table_class, а результат
+    возвращается обычным словарём: он сериализуется для передачи
+    в родительский процесс намного быстрее объекта таблицы.
+    
+    Returns:
+        Словарь {слово: частота} диапазона
+    """
+    freq_dict = hash_table_class(capacity=1000)
+    _count_range_into(freq_dict, path, start, end, chunk_size)
+    return dict(freq_dict.items())
+
+
+def merge_tables(left, right):
+    """
+    Слияние частотных словарей: счётчики right (таблица или dict) прибавляются к left.
+    
+    Временная сложность: O(размера right)
+    
+    Returns:
+        left
+    """
+    for word, count in right.items():
+        left.increment(word, count)
+    return left
+
+
+def build_frequency_dict_parallel(path: str, hash_table_class, workers: int = None,
+                                  chunk_size: int = 1 << 20):
+    """
+    Параллельное построение частотного словаря по файлу (map-reduce).
+    
+    Файл делится на workers диапазонов по границам слов (partition_file),
+    каждый считается в своём процессе (count_range), а частичные словари
+    сливаются один раз в родительском процессе по мере готовности.
+    Таблицы не пересылаются между процессами повторно, как при слиянии
+    деревом в пуле. Частоты совпадают с build_frequency_dict_from_file.
+    
+    Args:
+        path: Путь к текстовому файлу (UTF-8)
+        hash_table_class: Класс хэш-таблицы с increment и items
+        workers: Количество процессов (None - по числу ядер,
+            1 - build_frequency_dict_from_file без пула)
+        chunk_size: Размер порции чтения в байтах
+        
+    Returns:
+        Хэш-таблица с частотами слов
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0 or chunk_size <= 0:
+        raise ValueError("Количество процессов и размер порции должны быть положительными")
     
+    ranges = partition_file(path, workers)
+    if workers == 1 or len(ranges) <= 1:
+        return build_frequency_dict_from_file(path, hash_table_class, chunk_size)
+    
+    freq_dict = hash_table_class(capacity=1000)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(count_range, path, start, end, hash_table_class, chunk_size)
+                   for start, end in ranges]
+        for future in as_completed(futures):
+            merge_tables(freq_dict, future.result())
     return freq_dict
 
 
+class _RankedWord:
+    """
+    Элемент кучи топ-N: меньше тот, кто хуже в рейтинге.
+
+    Хуже - меньшая частота, при равной частоте - слово, которое
+    позже по алфавиту. Поэтому на вершине мин-кучи всегда лежит
+    кандидат на вытеснение.
+    """
+    
+    __slots__ = ("word", "count")
+    
+    def __init__(self, word: str, count: int):
+        self.word = word
+        self.count = count
+    
+    def __lt__(self, other):
+        if self.count != other.count:
+            return self.count < other.count
+        return self.word > other.word
+
+
 def get_top_words(freq_dict, top_n: int = 10):
     """
-    Получение топ-N самых частых слов.
+    Получение топ-N самых частых слов с помощью ограниченной мин-кучи.
+    
+    В куче хранится не больше top_n лучших слов; новое слово вытесняет
+    вершину кучи (худшее из них), только если оно лучше. Слова с равной
+    частотой упорядочиваются по алфавиту.
+    
+    Временная сложность: O(V log N), где V - количество различных слов
+    Память: O(N)
     
     Args:
-        freq_dict: Частотный словарь
+        freq_dict: Частотный словарь (объект с методом items(), например
+            хэш-таблица или Counter) или любой итерируемый источник пар
+            (слово, частота), в том числе генератор
         top_n: Количество слов для возврата
         
     Returns:
         Список кортежей (слово, частота), отсортированный по убыванию частоты
     """
-    items = list(freq_dict.items())
-    items.sort(key=lambda x: x[1], reverse=True)
-    return items[:top_n]
+    if top_n <= 0:
+        return []
+    items = freq_dict.items() if hasattr(freq_dict, "items") else freq_dict
+    heap = MinHeap()
+    for word, count in items:
+        if len(heap) < top_n:
+            heap.insert(_RankedWord(word, count))
+            continue
+        # Сравнение с вершиной без создания элемента: большинство слов отсеивается здесь
+        worst = heap.peek()
+        if count < worst.count or (count == worst.count and word >= worst.word):
+            continue
+        heap.extract_min()
+        heap.insert(_RankedWord(word, count))
+    
+    top_words = []
+    while len(heap) > 0:
+        ranked = heap.extract_min()
+        top_words.append((ranked.word, ranked.count))
+    top_words.reverse()
+    return top_words
+
+
+def _print_stats(stats: dict):
+    operations = stats["operations"]
+    print(f"  Заполнение: {stats['load_factor']:.3f}, максимальная цепочка: {stats['max_chain']}, "
+          f"непустых корзин: {stats['capacity'] - stats['bucket_histogram'].get(0, 0)}")
+    print(f"  Проб на операцию: попадание {operations['avg_probes_hit']:.2f}, "
+          f"промах {operations['avg_probes_miss']:.2f} "
+          f"(операций: {operations['hits'] + operations['misses']})")
 
 
 def compare_hash_functions():
@@ -148,17 +593,20 @@ def compare_hash_functions():
     
     print("=== Сравнение хэш-функций ===")
     print(f"Длина текста: {len(sample_text)} символов")
-    print(f"Количество слов: {len(re.findall(r'\\b\\w+\\b', sample_text.lower()))}")
+    word_count = len(re.findall(r'\b\w+\b', sample_text.lower()))
+    print(f"Количество слов: {word_count}")
     
     start_time = time.time()
-    bad_freq_dict = build_frequency_dict(sample_text, BadHashTable)
+    bad_freq_dict = build_frequency_dict(sample_text, BadHashTable, count_operations=True)
     bad_time = time.time() - start_time
     print(f"\nПлохая хэш-функция (всегда 1): {bad_time:.4f} сек")
+    _print_stats(bad_freq_dict.stats())
     
     start_time = time.time()
-    good_freq_dict = build_frequency_dict(sample_text, GoodHashTable)
+    good_freq_dict = build_frequency_dict(sample_text, GoodHashTable, count_operations=True)
     good_time = time.time() - start_time
     print(f"Хорошая хэш-функция (djb2): {good_time:.4f} сек")
+    _print_stats(good_freq_dict.stats())
     
     print(f"\nОтношение времени (плохая/хорошая): {bad_time/good_time:.2f}")
     
@@ -168,6 +616,154 @@ def compare_hash_functions():
         print(f"{i:2d}. {word:15s} : {count}")
 
 
+def compare_increment():
+    """
+    Сравнение цикла подсчёта: get + put (два поиска) против increment (один).
+    """
+    sample_text = """
+    The quick brown fox jumps over the lazy dog. The dog was sleeping under a tree.
+    A fox is a clever animal. The brown fox is quick. The lazy dog likes to sleep.
+    """ * 1000
+    words = re.findall(r'\b\w+\b', sample_text.lower())
+    
+    print("=== Сравнение get + put и increment ===")
+    print(f"Количество слов: {len(words)}")
+    
+    freq_dict = GoodHashTable(capacity=1000)
+    start_time = time.time()
+    for word in words:
+        current_count = freq_dict.get(word) or 0
+        freq_dict.put(word, current_count + 1)
+    get_put_time = time.time() - start_time
+    print(f"get + put: {get_put_time:.4f} сек")
+    
+    freq_dict = GoodHashTable(capacity=1000)
+    start_time = time.time()
+    for word in words:
+        freq_dict.increment(word)
+    increment_time = time.time() - start_time
+    print(f"increment: {increment_time:.4f} сек")
+    
+    print(f"\nУскорение: {get_put_time / increment_time:.2f}x")
+
+
+def compare_file_builder(repeat: int = 20000):
+    """
+    Сравнение построения словаря из строки и из файла по порциям:
+    время и пиковая память (tracemalloc, без учёта самой таблицы).
+    """
+    sample_text = """
+    The quick brown fox jumps over the lazy dog. The dog was sleeping under a tree.
+    A fox is a clever animal. The brown fox is quick. The lazy dog likes to sleep.
+    """ * repeat
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(sample_text)
+        del sample_text
+        
+        print("=== Сравнение построения словаря из строки и из файла ===")
+        print(f"Размер файла: {os.path.getsize(path):,} байт")
+        
+        def from_string():
+            with open(path, encoding="utf-8") as file:
+                return build_frequency_dict(file.read(), GoodHashTable)
+        
+        def from_file():
+            return build_frequency_dict_from_file(path, GoodHashTable, chunk_size=1 << 16)
+        
+        results = {}
+        for name, builder in (("Строка целиком", from_string), ("Файл по порциям", from_file)):
+            start_time = time.time()
+            results[name] = sorted(builder().items())
+            elapsed = time.time() - start_time
+            
+            tracemalloc.start()
+            builder()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name}: {elapsed:.4f} сек, пиковая память: {peak / 1024 / 1024:.2f} МБ")
+        
+        print(f"Результаты совпадают: {results['Строка целиком'] == results['Файл по порциям']}")
+
+
+def compare_parallel_builder(repeat: int = 50000, hash_table_class=None):
+    """
+    Ускорение параллельного построения словаря при 1..N процессах
+    и проверка совпадения с последовательным построением.
+    """
+    hash_table_class = hash_table_class or hash_table_module.HashTable
+    sample_text = """
+    The quick brown fox jumps over the lazy dog. The dog was sleeping under a tree.
+    A fox is a clever animal. The brown fox is quick. The lazy dog likes to sleep.
+    """
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            for i in range(repeat):
+                # Номер строки добавляет в словарь много редких слов
+                file.write(f"{sample_text} line{i % 5000}\n")
+        
+        print("=== Параллельное построение частотного словаря ===")
+        print(f"Размер файла: {os.path.getsize(path):,} байт, таблица: {hash_table_class.__name__}")
+        
+        start_time = time.time()
+        expected = sorted(build_frequency_dict_from_file(path, hash_table_class).items())
+        serial_time = time.time() - start_time
+        print(f"Последовательно: {serial_time:.4f} сек")
+        
+        max_workers = os.cpu_count() or 1
+        print(f"Ядер (os.cpu_count()): {max_workers}")
+        if max_workers == 1:
+            print("Доступно одно ядро: процессы выполняются по очереди, поэтому строки "
+                  "ниже показывают накладные расходы пула, а не масштабирование")
+        worker_counts = sorted({1, 2, 4, max_workers} if max_workers > 1 else {1, 2})
+        for workers in worker_counts:
+            start_time = time.time()
+            result = build_frequency_dict_parallel(path, hash_table_class, workers)
+            elapsed = time.time() - start_time
+            identical = sorted(result.items()) == expected
+            print(f"Процессов: {workers}: {elapsed:.4f} сек, ускорение: {serial_time / elapsed:.2f}x, "
+                  f"совпадает с последовательным: {identical}")
+
+
+def compare_top_words(vocabulary: int = 200000, top_n: int = 10):
+    """
+    Сравнение топ-N через полную сортировку словаря и через мин-кучу:
+    время и пиковая дополнительная память (tracemalloc).
+    """
+    counts = Counter({f"word{i}": vocabulary // (i + 1) for i in range(vocabulary)})
+    
+    def full_sort():
+        items = list(counts.items())
+        items.sort(key=lambda x: (-x[1], x[0]))
+        return items[:top_n]
+    
+    def bounded_heap():
+        return get_top_words(counts, top_n)
+    
+    print("=== Сравнение топ-N: полная сортировка и мин-куча ===")
+    print(f"Различных слов: {vocabulary}, N = {top_n}")
+    
+    results = {}
+    times = {}
+    for name, method in (("Полная сортировка", full_sort), ("Мин-куча", bounded_heap)):
+        start_time = time.time()
+        results[name] = method()
+        times[name] = time.time() - start_time
+        
+        tracemalloc.start()
+        method()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name}: {times[name]:.4f} сек, пиковая память: {peak / 1024:.1f} КБ")
+    
+    print(f"Результаты совпадают: {results['Полная сортировка'] == results['Мин-куча']}")
+    print(f"\nУскорение: {times['Полная сортировка'] / times['Мин-куча']:.2f}x")
+
+
 if __name__ == "__main__":
     text = """
     Python is a high-level programming language. Python is known for its simplicity.
@@ -187,7 +783,21 @@ if __name__ == "__main__":
     for i, (word, count) in enumerate(top_words, 1):
         print(f"{i:2d}. {word:15s} : {count}")
     
+    words = re.findall(r'\b\w+\b', text.lower())
+    print(f"\nТоп-3 по Counter: {get_top_words(Counter(words), 3)}")
+    print(f"Топ-3 по генератору пар: {get_top_words(((w, len(w)) for w in set(words)), 3)}")
+    
     print("\n" + "="*60)
     compare_hash_functions()
-
-
+    
+    print()
+    compare_increment()
+    
+    print()
+    compare_file_builder()
+    
+    print()
+    compare_parallel_builder()
+    
+    print()
+    compare_top_words()
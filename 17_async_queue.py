@@ -0,0 +1,298 @@
+"""
+Задание 17. Асинхронная очередь с обратным давлением
+
+Ограниченная очередь для asyncio на основе циклического массива:
+put() ждёт, пока очередь заполнена, get() ждёт, пока очередь пуста.
+Сравнение пропускной способности с asyncio.Queue.
+"""
+
+import asyncio
+import time
+import importlib.util
+import sys
+from collections import deque
+
+spec = importlib.util.spec_from_file_location("queue_module", "06_queue.py")
+queue_module = importlib.util.module_from_spec(spec)
+sys.modules["queue_module"] = queue_module
+spec.loader.exec_module(queue_module)
+CircularArrayQueue = queue_module.CircularArrayQueue
+
+
+class AsyncCircularQueue:
+    """
+    Ограниченная асинхронная очередь на основе CircularArrayQueue.
+
+    Future создаётся только для корутины, которой действительно приходится
+    ждать. Если место/элементы есть, put()/get() завершаются без ожидания,
+    а get_many() забирает за одно пробуждение сразу пачку элементов.
+    """
+
+    def __init__(self, capacity: int = 10):
+        """
+        Инициализация очереди.
+
+        Временная сложность: O(capacity)
+
+        Args:
+            capacity: Максимальное количество элементов в очереди
+        """
+        if capacity <= 0:
+            raise ValueError("Вместимость должна быть положительной")
+        self.queue = CircularArrayQueue(capacity)
+        self.capacity = capacity
+        self._getters = deque()
+        self._putters = deque()
+
+    def _wakeup_next(self, waiters: deque):
+        """Пробуждение первой ещё ожидающей корутины из списка."""
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters: deque, timeout: float = None) -> bool:
+        """
+        Ожидание пробуждения с корректной обработкой отмены.
+
+        Future ставится в список ожидающих до первой приостановки
+        корутины, поэтому пробуждение не теряется.
+
+        Returns:
+            False, если истёк timeout, иначе True
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            if timeout is None:
+                await waiter
+            else:
+                await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            # Нас не разбудили, поэтому передавать сигнал некому
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            return False
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            # Если нас уже разбудили, передаём сигнал следующему
+            if waiters is self._getters and not self.isEmpty():
+                self._wakeup_next(self._getters)
+            elif waiters is self._putters and not self.isFull():
+                self._wakeup_next(self._putters)
+            raise
+        return True
+
+    def put_nowait(self, value):
+        """
+        Добавление элемента без ожидания.
+
+        Временная сложность: O(1)
+
+        Raises:
+            OverflowError: Если очередь заполнена
+        """
+        self.queue.enqueue(value)
+        if self._getters:
+            self._wakeup_next(self._getters)
+
+    async def put(self, value):
+        """
+        Добавление элемента; ждёт, пока в очереди не появится место.
+
+        Временная сложность: O(1) без учёта ожидания
+        """
+        queue = self.queue
+        while queue.size >= self.capacity:
+            await self._wait(self._putters)
+        queue.enqueue(value)
+        if self._getters:
+            self._wakeup_next(self._getters)
+
+    def get_nowait(self):
+        """
+        Извлечение элемента без ожидания.
+
+        Временная сложность: O(1)
+
+        Raises:
+            IndexError: Если очередь пуста
+        """
+        value = self.queue.dequeue()
+        if self._putters:
+            self._wakeup_next(self._putters)
+        return value
+
+    async def get(self):
+        """
+        Извлечение элемента; ждёт, пока очередь пуста.
+
+        Временная сложность: O(1) без учёта ожидания
+        """
+        while self.queue.size == 0:
+            await self._wait(self._getters)
+        return self.get_nowait()
+
+    async def get_many(self, max_items: int, timeout: float = None) -> list:
+        """
+        Извлечение до max_items элементов за одно пробуждение.
+
+        Ждёт появления хотя бы одного элемента (не дольше timeout секунд),
+        после чего забирает всё доступное, но не больше max_items.
+
+        Временная сложность: O(k), где k - количество извлечённых элементов
+
+        Args:
+            max_items: Максимальное количество элементов
+            timeout: Максимальное время ожидания (None - без ограничения)
+
+        Returns:
+            Список элементов (пустой, если истёк timeout)
+        """
+        if max_items <= 0:
+            return []
+
+        if self.isEmpty():
+            if timeout is None:
+                while self.isEmpty():
+                    await self._wait(self._getters)
+            else:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                while self.isEmpty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0 or not await self._wait(self._getters, remaining):
+                        break
+                if self.isEmpty():
+                    return []
+
+        queue = self.queue
+        count = min(max_items, queue.size)
+        items = [queue.dequeue() for _ in range(count)]
+        for _ in range(count):
+            if not self._putters:
+                break
+            self._wakeup_next(self._putters)
+
+        if not self.isEmpty():
+            self._wakeup_next(self._getters)
+        return items
+
+    def isEmpty(self):
+        """
+        Проверка на пустоту.
+
+        Временная сложность: O(1)
+        """
+        return self.queue.size == 0
+
+    def isFull(self):
+        """
+        Проверка на заполненность.
+
+        Временная сложность: O(1)
+        """
+        return self.queue.size >= self.capacity
+
+    def __len__(self):
+        return self.queue.size
+
+    def __str__(self):
+        return str(self.queue)
+
+
+def compare_with_asyncio_queue(producers: int = 1000, messages_per_producer: int = 100,
+                               capacity: int = 1024, batch_size: int = 256):
+    """
+    Сравнение пропускной способности с asyncio.Queue при сходящемся потоке
+    (fan-in) от множества корутин-производителей к одному потребителю.
+    """
+    total = producers * messages_per_producer
+
+    async def producer(queue, start):
+        for i in range(start, start + messages_per_producer):
+            await queue.put(i)
+
+    async def run_asyncio_queue():
+        queue = asyncio.Queue(maxsize=capacity)
+        tasks = [asyncio.create_task(producer(queue, p * messages_per_producer))
+                 for p in range(producers)]
+        received = 0
+        while received < total:
+            await queue.get()
+            received += 1
+        await asyncio.gather(*tasks)
+        return received
+
+    async def run_circular_get():
+        queue = AsyncCircularQueue(capacity)
+        tasks = [asyncio.create_task(producer(queue, p * messages_per_producer))
+                 for p in range(producers)]
+        received = 0
+        while received < total:
+            await queue.get()
+            received += 1
+        await asyncio.gather(*tasks)
+        return received
+
+    async def run_circular_batch():
+        queue = AsyncCircularQueue(capacity)
+        tasks = [asyncio.create_task(producer(queue, p * messages_per_producer))
+                 for p in range(producers)]
+        received = 0
+        while received < total:
+            batch = await queue.get_many(batch_size)
+            received += len(batch)
+        await asyncio.gather(*tasks)
+        return received
+
+    print("=== Сравнение асинхронных очередей ===")
+    print(f"Производителей: {producers}, сообщений: {total}, вместимость: {capacity}")
+
+    results = {}
+    for name, runner in [("asyncio.Queue (get)", run_asyncio_queue),
+                         ("AsyncCircularQueue (get)", run_circular_get),
+                         (f"AsyncCircularQueue (get_many {batch_size})", run_circular_batch)]:
+        start_time = time.time()
+        received = asyncio.run(runner())
+        elapsed = time.time() - start_time
+        results[name] = elapsed
+        print(f"{name:40s}: {elapsed:.4f} сек, {received / elapsed:,.0f} сообщ/сек")
+
+    base = results.pop("asyncio.Queue (get)")
+    for name, elapsed in results.items():
+        print(f"Ускорение {name} относительно asyncio.Queue: {base / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование асинхронной очереди ===")
+
+    async def demo():
+        queue = AsyncCircularQueue(3)
+
+        async def slow_consumer():
+            await asyncio.sleep(0.01)
+            return [await queue.get() for _ in range(5)]
+
+        consumer = asyncio.create_task(slow_consumer())
+        for i in range(1, 6):
+            await queue.put(i)
+            print(f"put({i}) -> {queue}")
+        print(f"Получено потребителем: {await consumer}")
+
+        for i in range(3):
+            queue.put_nowait(i)
+        print(f"get_many(10) = {await queue.get_many(10)}")
+        print(f"get_many(10, timeout=0.05) = {await queue.get_many(10, timeout=0.05)}")
+
+    asyncio.run(demo())
+
+    print()
+    compare_with_asyncio_queue()
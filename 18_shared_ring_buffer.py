@@ -0,0 +1,325 @@
+"""
+Задание 18. Кольцевой буфер в разделяемой памяти
+
+Очередь «один производитель - один потребитель» (SPSC) между процессами
+на основе циклического массива в multiprocessing.shared_memory.
+Сравнение пропускной способности с multiprocessing.Queue.
+"""
+
+import time
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+# Индексы служебных полей заголовка (в 8-байтовых словах).
+# head и tail разнесены по разным строкам кэша (64 байта),
+# чтобы производитель и потребитель не мешали друг другу.
+_CAPACITY = 0
+_RECORD_SIZE = 1
+_HEAD = 8
+_TAIL = 16
+_HEADER_SIZE = 192
+
+_LENGTH = struct.Struct("<I")
+
+
+class SharedRingBuffer:
+    """
+    Кольцевой буфер SPSC в разделяемой памяти.
+
+    Использует ту же арифметику, что и CircularArrayQueue, но head и tail -
+    монотонно растущие счётчики байтов, а позиция в массиве равна
+    счётчику по модулю capacity. Производитель пишет только tail,
+    потребитель - только head, поэтому на быстром пути блокировки не нужны:
+    данные записываются до публикации нового tail, а освобождённое место
+    становится доступно только после публикации нового head.
+
+    Режимы:
+    - record_size > 0: записи фиксированного размера без заголовка;
+    - record_size == 0: байтовые сообщения с 4-байтовым префиксом длины.
+    """
+
+    def __init__(self, capacity: int = 1 << 20, record_size: int = 0, name: str = None):
+        """
+        Создание нового буфера.
+
+        Временная сложность: O(1)
+
+        Args:
+            capacity: Размер области данных в байтах
+            record_size: Размер записи (0 - сообщения переменной длины)
+            name: Имя блока разделяемой памяти (None - сгенерировать)
+        """
+        if capacity <= 0:
+            raise ValueError("Вместимость должна быть положительной")
+        if record_size < 0:
+            raise ValueError("Размер записи не может быть отрицательным")
+        if record_size and capacity % record_size:
+            raise ValueError("Вместимость должна быть кратна размеру записи")
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER_SIZE + capacity)
+        self._attach(shm, owner=True, capacity=capacity)
+        self._index[_CAPACITY] = capacity
+        self._index[_RECORD_SIZE] = record_size
+        self._index[_HEAD] = 0
+        self._index[_TAIL] = 0
+        self.capacity = capacity
+        self.record_size = record_size
+
+    @classmethod
+    def attach(cls, name: str):
+        """
+        Подключение к уже созданному буферу из другого процесса.
+
+        Args:
+            name: Имя блока разделяемой памяти (атрибут name создателя)
+        """
+        ring = cls.__new__(cls)
+        ring._attach(shared_memory.SharedMemory(name=name), owner=False)
+        ring.capacity = ring._index[_CAPACITY]
+        ring.record_size = ring._index[_RECORD_SIZE]
+        return ring
+
+    def _attach(self, shm, owner: bool, capacity: int = None):
+        """
+        Построение представлений заголовка и области данных.
+
+        Блок может оказаться больше запрошенного (на macOS и Windows размер
+        округляется до страницы), поэтому область данных обрезается
+        до capacity; при подключении capacity читается из заголовка.
+        """
+        self._shm = shm
+        self._owner = owner
+        self._index = shm.buf[:_HEADER_SIZE].cast("Q")
+        if capacity is None:
+            capacity = self._index[_CAPACITY]
+        self._data = shm.buf[_HEADER_SIZE:_HEADER_SIZE + capacity]
+        self.name = shm.name
+
+    def _write(self, position: int, data):
+        """Запись байтов с переходом через конец массива."""
+        start = position % self.capacity
+        end = start + len(data)
+        if end <= self.capacity:
+            self._data[start:end] = data
+        else:
+            first = self.capacity - start
+            self._data[start:] = data[:first]
+            self._data[:end - self.capacity] = data[first:]
+
+    def _read(self, position: int, length: int) -> bytes:
+        """Чтение байтов с переходом через конец массива."""
+        start = position % self.capacity
+        end = start + length
+        if end <= self.capacity:
+            return bytes(self._data[start:end])
+        return bytes(self._data[start:]) + bytes(self._data[:end - self.capacity])
+
+    def _encode(self, payload) -> bytes:
+        if self.record_size:
+            if len(payload) != self.record_size:
+                raise ValueError(f"Размер записи должен быть {self.record_size} байт")
+            return payload
+        return _LENGTH.pack(len(payload)) + payload
+
+    def enqueue(self, payload: bytes):
+        """
+        Добавление записи (только процесс-производитель).
+
+        Временная сложность: O(m), где m - размер записи
+
+        Raises:
+            OverflowError: Если в буфере недостаточно места
+        """
+        if self.enqueue_many([payload]) == 0:
+            raise OverflowError("Очередь переполнена")
+
+    def enqueue_many(self, payloads) -> int:
+        """
+        Добавление пачки записей с единственной публикацией tail.
+
+        Записывает записи по порядку, пока хватает места.
+
+        Временная сложность: O(суммарный размер записей)
+
+        Returns:
+            Количество записанных записей
+        """
+        index = self._index
+        tail = index[_TAIL]
+        free = self.capacity - (tail - index[_HEAD])
+
+        chunks = []
+        used = 0
+        for payload in payloads:
+            chunk = self._encode(payload)
+            if used + len(chunk) > free:
+                if len(chunk) > self.capacity:
+                    raise ValueError("Запись больше вместимости буфера")
+                break
+            chunks.append(chunk)
+            used += len(chunk)
+
+        if chunks:
+            self._write(tail, b"".join(chunks))
+            index[_TAIL] = tail + used
+        return len(chunks)
+
+    def dequeue(self) -> bytes:
+        """
+        Извлечение записи (только процесс-потребитель).
+
+        Временная сложность: O(m), где m - размер записи
+
+        Raises:
+            IndexError: Если буфер пуст
+        """
+        items = self.dequeue_many(1)
+        if not items:
+            raise IndexError("Очередь пуста")
+        return items[0]
+
+    def dequeue_many(self, max_items: int) -> list:
+        """
+        Извлечение до max_items записей с единственной публикацией head.
+
+        Временная сложность: O(суммарный размер записей)
+
+        Returns:
+            Список записей (пустой, если буфер пуст)
+        """
+        index = self._index
+        head = index[_HEAD]
+        available = index[_TAIL] - head
+        if available == 0 or max_items <= 0:
+            return []
+
+        if self.record_size:
+            size = self.record_size
+            count = min(max_items, available // size)
+            block = self._read(head, count * size)
+            items = [block[i:i + size] for i in range(0, len(block), size)]
+            index[_HEAD] = head + count * size
+            return items
+
+        items = []
+        position = head
+        end = head + available
+        while position < end and len(items) < max_items:
+            (length,) = _LENGTH.unpack(self._read(position, _LENGTH.size))
+            items.append(self._read(position + _LENGTH.size, length))
+            position += _LENGTH.size + length
+        index[_HEAD] = position
+        return items
+
+    def isEmpty(self):
+        """
+        Проверка на пустоту.
+
+        Временная сложность: O(1)
+        """
+        return self._index[_TAIL] == self._index[_HEAD]
+
+    def __len__(self):
+        """Количество занятых байтов."""
+        return self._index[_TAIL] - self._index[_HEAD]
+
+    def close(self):
+        """Отключение от разделяемой памяти (создатель также удаляет блок)."""
+        self._index.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _ring_producer(name: str, count: int, record_size: int, batch_size: int):
+    """Процесс-производитель для сравнения."""
+    ring = SharedRingBuffer.attach(name)
+    record = b"x" * record_size
+    batch = [record] * batch_size
+    sent = 0
+    while sent < count:
+        written = ring.enqueue_many(batch[:min(batch_size, count - sent)])
+        if written == 0:
+            time.sleep(0)
+        sent += written
+    ring.close()
+
+
+def _queue_producer(queue, count: int, record_size: int):
+    """Процесс-производитель для multiprocessing.Queue."""
+    record = b"x" * record_size
+    for _ in range(count):
+        queue.put(record)
+
+
+def compare_with_multiprocessing_queue(count: int = 200_000, record_size: int = 16,
+                                       batch_size: int = 1024):
+    """
+    Сравнение передачи count записей между двумя процессами
+    через SharedRingBuffer и multiprocessing.Queue.
+    """
+    print("=== Сравнение межпроцессных очередей ===")
+    print(f"Записей: {count}, размер записи: {record_size} байт")
+
+    ring = SharedRingBuffer(capacity=record_size * 64 * 1024, record_size=record_size)
+    start_time = time.time()
+    producer = multiprocessing.Process(target=_ring_producer,
+                                       args=(ring.name, count, record_size, batch_size))
+    producer.start()
+    received = 0
+    while received < count:
+        items = ring.dequeue_many(batch_size)
+        if not items:
+            time.sleep(0)
+        received += len(items)
+    producer.join()
+    ring_time = time.time() - start_time
+    ring.close()
+    print(f"SharedRingBuffer: {ring_time:.4f} сек, {count / ring_time:,.0f} записей/сек")
+
+    queue = multiprocessing.Queue()
+    start_time = time.time()
+    producer = multiprocessing.Process(target=_queue_producer,
+                                       args=(queue, count, record_size))
+    producer.start()
+    for _ in range(count):
+        queue.get()
+    producer.join()
+    queue_time = time.time() - start_time
+    print(f"multiprocessing.Queue: {queue_time:.4f} сек, {count / queue_time:,.0f} записей/сек")
+
+    print(f"\nУскорение: {queue_time / ring_time:.2f}x")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование кольцевого буфера ===")
+
+    with SharedRingBuffer(capacity=32) as ring:
+        for message in [b"hello", b"shared", b"memory"]:
+            ring.enqueue(message)
+        print(f"Занято байтов: {len(ring)}")
+        print(f"dequeue() = {ring.dequeue()}")
+        ring.enqueue(b"wrap!")
+        print(f"dequeue_many(10) = {ring.dequeue_many(10)}")
+        try:
+            ring.enqueue(b"x" * 40)
+        except (OverflowError, ValueError) as error:
+            print(f"Слишком большая запись: {error}")
+
+    with SharedRingBuffer(capacity=24, record_size=8) as ring:
+        print(f"\nenqueue_many(4 записи) = {ring.enqueue_many([bytes([i]) * 8 for i in range(4)])}")
+        print(f"dequeue_many(2) = {ring.dequeue_many(2)}")
+        print(f"enqueue_many(2 записи) = {ring.enqueue_many([b'A' * 8, b'B' * 8])}")
+        print(f"dequeue_many(10) = {ring.dequeue_many(10)}")
+
+    print()
+    compare_with_multiprocessing_queue()
@@ -0,0 +1,437 @@
+"""
+Задание 19. Дек с кражей работы и пул потоков
+
+Реализация дека с кражей работы (work-stealing deque) на циклическом массиве
+и пула потоков, в котором у каждого рабочего свой дек.
+Сравнение с пулом на одной общей очереди queue.Queue.
+"""
+
+import time
+import random
+import threading
+import queue
+import importlib.util
+import sys
+from collections import deque
+from concurrent.futures import Future
+
+spec = importlib.util.spec_from_file_location("priority_queue_module", "16_priority_queue.py")
+priority_queue_module = importlib.util.module_from_spec(spec)
+sys.modules["priority_queue_module"] = priority_queue_module
+spec.loader.exec_module(priority_queue_module)
+Task = priority_queue_module.Task
+task_scheduling = priority_queue_module.task_scheduling
+
+
+class WorkStealingDeque:
+    """
+    Дек с кражей работы на основе циклического массива (схема Chase-Lev).
+
+    Владелец добавляет и извлекает элементы с «нижнего» конца (LIFO),
+    воры забирают элементы с «верхнего» конца (FIFO). top и bottom -
+    монотонные счётчики, позиция в массиве - счётчик по модулю вместимости,
+    как в CircularArrayQueue. Вместо атомарного CAS воры берут общий замок;
+    владелец обращается к нему только при борьбе за последний элемент.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Инициализация дека.
+
+        Временная сложность: O(capacity)
+        """
+        self.data = [None] * capacity
+        self.top = 0
+        self.bottom = 0
+        self._steal_lock = threading.Lock()
+
+    def push(self, value):
+        """
+        Добавление элемента владельцем.
+
+        Амортизированная временная сложность: O(1)
+        """
+        bottom = self.bottom
+        data = self.data
+        if bottom - self.top >= len(data):
+            data = self._grow(bottom)
+        data[bottom % len(data)] = value
+        self.bottom = bottom + 1
+
+    def _grow(self, bottom: int) -> list:
+        """
+        Увеличение массива в 2 раза.
+
+        Старый массив не изменяется, поэтому вор, успевший взять
+        ссылку на него, прочитает корректный элемент.
+
+        Временная сложность: O(n)
+        """
+        old = self.data
+        new = [None] * (len(old) * 2)
+        for i in range(self.top, bottom):
+            new[i % len(new)] = old[i % len(old)]
+        self.data = new
+        return new
+
+    def pop(self):
+        """
+        Извлечение последнего добавленного элемента владельцем.
+
+        Временная сложность: O(1)
+
+        Returns:
+            Элемент или None, если дек пуст
+        """
+        bottom = self.bottom - 1
+        self.bottom = bottom
+        data = self.data
+        if self.top < bottom:
+            value = data[bottom % len(data)]
+            data[bottom % len(data)] = None
+            return value
+
+        # Остался не более чем один элемент - возможна гонка с вором
+        with self._steal_lock:
+            top = self.top
+            if top > bottom:
+                self.bottom = top
+                return None
+            value = data[bottom % len(data)]
+            data[bottom % len(data)] = None
+            self.top = top + 1
+            self.bottom = top + 1
+            return value
+
+    def steal(self):
+        """
+        Кража самого старого элемента другим потоком.
+
+        Временная сложность: O(1)
+
+        Returns:
+            Элемент или None, если дек пуст
+        """
+        with self._steal_lock:
+            top = self.top
+            if top >= self.bottom:
+                return None
+            data = self.data
+            value = data[top % len(data)]
+            data[top % len(data)] = None
+            self.top = top + 1
+            return value
+
+    def isEmpty(self):
+        """
+        Проверка на пустоту (приблизительная при конкурентном доступе).
+
+        Временная сложность: O(1)
+        """
+        return self.bottom <= self.top
+
+    def __len__(self):
+        return max(self.bottom - self.top, 0)
+
+
+def run_task(task: Task):
+    """
+    Выполнение задачи Task: task.duration единиц вычислительной работы.
+
+    Returns:
+        Название задачи
+    """
+    total = 0
+    for i in range(task.duration * 100):
+        total += i
+    return task.name
+
+
+class _Worker:
+    """Рабочий пула: собственный дек и счётчики."""
+
+    def __init__(self, index: int, capacity: int):
+        self.index = index
+        self.deque = WorkStealingDeque(capacity)
+        self.executed = 0
+        self.steals = 0
+        self.steal_attempts = 0
+        self.max_depth = 0
+        self.thread = None
+
+
+class WorkStealingExecutor:
+    """
+    Пул потоков с кражей работы.
+
+    Задачи, созданные внутри рабочего потока, попадают в его собственный дек;
+    задачи извне - в общую входную очередь. Свободный рабочий сначала берёт
+    работу из своего дека, затем из входной очереди, затем крадёт у других.
+    """
+
+    def __init__(self, num_workers: int = 4, capacity: int = 64):
+        """
+        Запуск пула.
+
+        Args:
+            num_workers: Количество рабочих потоков
+            capacity: Начальная вместимость дека каждого рабочего
+        """
+        if num_workers <= 0:
+            raise ValueError("Количество рабочих должно быть положительным")
+        self.workers = [_Worker(i, capacity) for i in range(num_workers)]
+        self._injector = deque()
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._idle = 0
+        self._shutdown = False
+        for worker in self.workers:
+            worker.thread = threading.Thread(target=self._run, args=(worker,), daemon=True)
+            worker.thread.start()
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Постановка функции на выполнение.
+
+        Временная сложность: O(1)
+
+        Returns:
+            concurrent.futures.Future с результатом
+        """
+        if self._shutdown:
+            raise RuntimeError("Пул остановлен")
+        future = Future()
+        item = (future, fn, args)
+        worker = getattr(self._local, "worker", None)
+        if worker is not None:
+            worker.deque.push(item)
+            depth = len(worker.deque)
+            if depth > worker.max_depth:
+                worker.max_depth = depth
+        else:
+            self._injector.append(item)
+        if self._idle:
+            with self._condition:
+                self._condition.notify()
+        return future
+
+    def submit_task(self, task: Task) -> Future:
+        """Постановка на выполнение задачи Task."""
+        return self.submit(run_task, task)
+
+    def run_tasks(self, tasks: list) -> list:
+        """
+        Выполнение списка задач Task в порядке приоритета.
+
+        Returns:
+            Результаты в порядке task_scheduling
+        """
+        futures = [self.submit_task(task) for task in task_scheduling(tasks)]
+        return [future.result() for future in futures]
+
+    def _find_work(self, worker: _Worker):
+        item = worker.deque.pop()
+        if item is not None:
+            return item
+        try:
+            return self._injector.popleft()
+        except IndexError:
+            pass
+        victims = len(self.workers)
+        start = random.randrange(victims)
+        for offset in range(victims):
+            victim = self.workers[(start + offset) % victims]
+            if victim is worker:
+                continue
+            worker.steal_attempts += 1
+            item = victim.deque.steal()
+            if item is not None:
+                worker.steals += 1
+                return item
+        return None
+
+    def _run(self, worker: _Worker):
+        self._local.worker = worker
+        while True:
+            item = self._find_work(worker)
+            if item is None:
+                if self._shutdown:
+                    return
+                with self._condition:
+                    self._idle += 1
+                    self._condition.wait(0.01)
+                    self._idle -= 1
+                continue
+
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as error:
+                future.set_exception(error)
+            worker.executed += 1
+
+    def stats(self) -> dict:
+        """
+        Метрики пула: выполненные задачи, кражи и глубина деков.
+        """
+        return {
+            "executed": [w.executed for w in self.workers],
+            "steals": sum(w.steals for w in self.workers),
+            "steal_attempts": sum(w.steal_attempts for w in self.workers),
+            "queue_depth": [len(w.deque) for w in self.workers],
+            "max_queue_depth": [w.max_depth for w in self.workers],
+            "injector_depth": len(self._injector),
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Остановка пула после выполнения всех поставленных задач."""
+        self._shutdown = True
+        with self._condition:
+            self._condition.notify_all()
+        if wait:
+            for worker in self.workers:
+                worker.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+class SharedQueueExecutor:
+    """
+    Пул потоков с одной общей очередью queue.Queue (для сравнения).
+    """
+
+    def __init__(self, num_workers: int = 4):
+        self._queue = queue.Queue()
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(num_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as error:
+                future.set_exception(error)
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def compare_with_shared_queue(num_workers: int = 4, roots: int = 200, fanout: int = 4,
+                              depth: int = 3):
+    """
+    Сравнение пула с кражей работы и пула на общей queue.Queue
+    на несбалансированной нагрузке: дерево задач, где лишь часть
+    корней порождает подзадачи, а длительности распределены неравномерно.
+    """
+    rng = random.Random(42)
+    durations = [rng.choice([1, 1, 1, 2, 5, 50]) for _ in range(roots)]
+
+    def make_tree(executor, level, duration):
+        run_task(Task("узел", 0, duration))
+        if level == 0:
+            return 1
+        futures = [executor.submit(make_tree, executor, level - 1, duration)
+                   for _ in range(fanout if duration > 1 else 1)]
+        # Результаты потомков не ожидаем, чтобы не блокировать рабочего
+        return len(futures)
+
+    def run(executor):
+        futures = [executor.submit(make_tree, executor, depth, d) for d in durations]
+        for future in futures:
+            future.result()
+
+    def wait_all():
+        while counter["done"] < expected:
+            time.sleep(0.001)
+
+    print("=== Сравнение пулов потоков ===")
+    print(f"Рабочих: {num_workers}, корневых задач: {roots}, ветвление: {fanout}, глубина: {depth}")
+
+    counter = {"done": 0}
+    lock = threading.Lock()
+    # Узлов в дереве: 1 + fanout + ... + fanout^depth (при ветвлении 1 - depth + 1)
+    expected = sum((fanout ** (depth + 1) - 1) // (fanout - 1) if d > 1 and fanout != 1
+                   else depth + 1 for d in durations)
+
+    def counted(fn):
+        def wrapper(*args):
+            # Считаем и упавшие задачи, иначе wait_all ждал бы вечно
+            try:
+                return fn(*args)
+            finally:
+                with lock:
+                    counter["done"] += 1
+        return wrapper
+
+    make_tree = counted(make_tree)
+
+    start_time = time.time()
+    executor = WorkStealingExecutor(num_workers)
+    run(executor)
+    wait_all()
+    ws_time = time.time() - start_time
+    stats = executor.stats()
+    executor.shutdown()
+    print(f"WorkStealingExecutor: {ws_time:.4f} сек ({expected} задач)")
+    print(f"  Выполнено по рабочим: {stats['executed']}")
+    print(f"  Краж: {stats['steals']} из {stats['steal_attempts']} попыток")
+    print(f"  Максимальная глубина деков: {stats['max_queue_depth']}")
+
+    counter["done"] = 0
+    start_time = time.time()
+    executor = SharedQueueExecutor(num_workers)
+    run(executor)
+    wait_all()
+    shared_time = time.time() - start_time
+    executor.shutdown()
+    print(f"SharedQueueExecutor (queue.Queue): {shared_time:.4f} сек")
+
+    print(f"\nОтношение времени (общая очередь/кража работы): {shared_time / ws_time:.2f}")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование дека с кражей работы ===")
+    dq = WorkStealingDeque(capacity=2)
+    for i in range(5):
+        dq.push(i)
+    print(f"После push(0..4): длина={len(dq)}, вместимость={len(dq.data)}")
+    print(f"steal() = {dq.steal()}")
+    print(f"pop() = {dq.pop()}")
+    print(f"steal() = {dq.steal()}")
+    print(f"pop() = {dq.pop()}, pop() = {dq.pop()}, pop() = {dq.pop()}")
+
+    print("\n=== Выполнение задач Task в пуле ===")
+    tasks = [
+        Task("Написать код", 2, 120),
+        Task("Исправить баги", 1, 60),
+        Task("Написать документацию", 3, 90),
+        Task("Критический баг", 0, 30),
+    ]
+    with WorkStealingExecutor(num_workers=2) as executor:
+        print(f"Результаты: {executor.run_tasks(tasks)}")
+        print(f"Метрики: {executor.stats()}")
+
+    print()
+    compare_with_shared_queue()
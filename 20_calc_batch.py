@@ -0,0 +1,197 @@
+"""
+Задание 20. Пакетное вычисление файла выражений
+
+Потоковое вычисление файла с выражениями (по одному в строке)
+на пуле процессов с сохранением порядка строк.
+
+Запуск из командной строки:
+    python -m 20_calc_batch calc-batch in.txt out.txt [--workers N] [--chunk-size N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import importlib.util
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+spec = importlib.util.spec_from_file_location("calculator_module", "07_calculator.py")
+calculator_module = importlib.util.module_from_spec(spec)
+sys.modules["calculator_module"] = calculator_module
+spec.loader.exec_module(calculator_module)
+Calculator = calculator_module.Calculator
+
+ERROR_PREFIX = "ERROR: "
+
+# Калькулятор процесса-исполнителя (создаётся при первом обращении,
+# чтобы кэш скомпилированных выражений жил между порциями)
+_calculator = None
+
+
+def evaluate_lines(lines: list) -> list:
+    """
+    Вычисление порции строк.
+
+    Ошибка в строке не прерывает обработку: вместо результата
+    возвращается строка с префиксом ERROR_PREFIX. Пустые строки
+    остаются пустыми.
+
+    Временная сложность: O(суммарной длины строк)
+
+    Args:
+        lines: Строки с выражениями
+
+    Returns:
+        Строки результатов (без перевода строки)
+    """
+    global _calculator
+    if _calculator is None:
+        _calculator = Calculator()
+    calc = _calculator
+
+    results = []
+    for line in lines:
+        expression = line.strip()
+        if not expression:
+            results.append("")
+            continue
+        try:
+            results.append(repr(calc.calculate(expression)))
+        except Exception as error:
+            results.append(f"{ERROR_PREFIX}{error}")
+    return results
+
+
+def _read_chunks(file, chunk_size: int):
+    """Чтение файла порциями по chunk_size строк."""
+    chunk = []
+    for line in file:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_results(file, results: list, stats: dict):
+    for result in results:
+        if result.startswith(ERROR_PREFIX):
+            stats["errors"] += 1
+        file.write(result)
+        file.write("\n")
+    stats["lines"] += len(results)
+
+
+def evaluate_file(input_path: str, output_path: str, workers: int = None,
+                  chunk_size: int = 10000) -> dict:
+    """
+    Вычисление всех выражений файла с записью результатов в том же порядке.
+
+    Одновременно в обработке находится не более 2 * workers порций,
+    поэтому пиковая память зависит от chunk_size, а не от размера файла.
+
+    Args:
+        input_path: Файл с выражениями (по одному в строке)
+        output_path: Файл для результатов
+        workers: Количество процессов (None - по числу ядер, 1 - без пула)
+        chunk_size: Количество строк в порции
+
+    Returns:
+        Статистика: строки, ошибки, время
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0 or chunk_size <= 0:
+        raise ValueError("Количество процессов и размер порции должны быть положительными")
+
+    stats = {"lines": 0, "errors": 0, "seconds": 0.0}
+    start_time = time.time()
+
+    with open(input_path, encoding="utf-8") as source, \
+            open(output_path, "w", encoding="utf-8") as target:
+        chunks = _read_chunks(source, chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                _write_results(target, evaluate_lines(chunk), stats)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(evaluate_lines, chunk))
+                    if len(pending) >= 2 * workers:
+                        _write_results(target, pending.popleft().result(), stats)
+                while pending:
+                    _write_results(target, pending.popleft().result(), stats)
+
+    stats["seconds"] = time.time() - start_time
+    return stats
+
+
+def compare_worker_scaling(lines: int = 200000, chunk_size: int = 5000):
+    """
+    Измерение пропускной способности evaluate_file при разном числе процессов.
+    """
+    expressions = [
+        "3 + 4 * 2",
+        "(1 + 2) * (3 + 4) / 5",
+        "2 ^ 10 - 100 / 4 + 7 * (8 - 3)",
+        "10 / (5 - 5)",
+        "((12.5 + 7.5) * 3 - 4) / (2 + 6 ^ 2)",
+    ]
+
+    print("=== Масштабирование пакетного вычисления ===")
+    print(f"Строк: {lines}, размер порции: {chunk_size}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "in.txt")
+        output_path = os.path.join(directory, "out.txt")
+        with open(input_path, "w", encoding="utf-8") as file:
+            for i in range(lines):
+                # Разные константы, чтобы кэш выражений не скрывал разбор
+                file.write(f"{expressions[i % len(expressions)]} + {i % 1000}\n")
+
+        base_time = None
+        max_workers = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, max_workers} if max_workers > 1 else {1})
+        for workers in worker_counts:
+            stats = evaluate_file(input_path, output_path, workers, chunk_size)
+            if base_time is None:
+                base_time = stats["seconds"]
+            print(f"Процессов: {workers}: {stats['seconds']:.4f} сек, "
+                  f"{stats['lines'] / stats['seconds']:,.0f} строк/сек, "
+                  f"ошибок: {stats['errors']}, "
+                  f"ускорение: {base_time / stats['seconds']:.2f}x")
+
+
+def main(argv: list = None) -> int:
+    """Точка входа командной строки."""
+    parser = argparse.ArgumentParser(description="Пакетное вычисление выражений")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("calc-batch", help="вычислить файл выражений")
+    batch.add_argument("input", help="файл с выражениями (по одному в строке)")
+    batch.add_argument("output", help="файл для результатов")
+    batch.add_argument("--workers", type=int, default=None,
+                       help="количество процессов (по умолчанию - число ядер)")
+    batch.add_argument("--chunk-size", type=int, default=10000,
+                       help="количество строк в порции")
+
+    args = parser.parse_args(argv)
+    stats = evaluate_file(args.input, args.output, args.workers, args.chunk_size)
+    print(f"Строк: {stats['lines']}, ошибок: {stats['errors']}, "
+          f"время: {stats['seconds']:.4f} сек", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
+    print("=== Тестирование пакетного вычисления ===")
+    print(evaluate_lines(["3 + 4 * 2", "", "1 / 0", "2 ^ 3", "2 $ 3"]))
+
+    print()
+    compare_worker_scaling()
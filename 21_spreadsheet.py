@@ -0,0 +1,317 @@
+"""
+Задание 21. Инкрементальный пересчёт формул (электронная таблица)
+
+Ячейки содержат числа или формулы Calculator, ссылающиеся на другие ячейки.
+При изменении ячейки пересчитываются только зависящие от неё формулы
+в топологическом порядке. Циклические зависимости запрещены.
+"""
+
+import time
+import importlib.util
+import sys
+from collections import deque
+
+spec = importlib.util.spec_from_file_location("calculator_module", "07_calculator.py")
+calculator_module = importlib.util.module_from_spec(spec)
+sys.modules["calculator_module"] = calculator_module
+spec.loader.exec_module(calculator_module)
+Calculator = calculator_module.Calculator
+
+
+class Spreadsheet:
+    """
+    Граф зависимостей ячеек поверх Calculator.
+
+    Для каждой формулы один раз строится скомпилированная функция
+    (Calculator.compile), поэтому при пересчёте формулы не разбираются
+    заново. Изменение ячейки помечает «грязными» её транзитивно зависимые
+    ячейки, которые затем вычисляются в топологическом порядке (алгоритм Кана).
+    """
+
+    def __init__(self, calculator: Calculator = None):
+        """
+        Инициализация пустой таблицы.
+
+        Args:
+            calculator: Калькулятор для компиляции формул
+        """
+        self.calculator = calculator or Calculator(cache_size=0)
+        self.values = {}
+        self.errors = {}
+        self.formulas = {}
+        self.functions = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.dirty = set()
+        self.evaluations = 0
+
+    def set_value(self, name: str, value: float):
+        """
+        Запись числа в ячейку с пересчётом зависимых ячеек.
+
+        Временная сложность: O(k), где k - количество зависимых ячеек и связей
+        """
+        self._assign_value(name, value)
+        self.recalculate()
+
+    def set_formula(self, name: str, expression: str):
+        """
+        Запись формулы в ячейку с пересчётом её и зависимых ячеек.
+
+        Временная сложность: O(n + k), где n - длина формулы
+
+        Raises:
+            ValueError: Если формула создаёт циклическую зависимость
+        """
+        self._assign_formula(name, expression)
+        self.recalculate()
+
+    def update(self, cells: dict):
+        """
+        Пакетное изменение ячеек с одним пересчётом.
+
+        Изменение атомарно: если какая-либо ячейка пакета не принята
+        (цикл, ошибка разбора формулы), таблица и граф зависимостей
+        возвращаются к состоянию до вызова.
+
+        Args:
+            cells: {имя: число или формула (строка)}
+
+        Raises:
+            ValueError: Если формула некорректна или создаёт циклическую зависимость
+        """
+        saved = [self._save_cell(name) for name in cells]
+        dirty = set(self.dirty)
+        try:
+            for name, content in cells.items():
+                if isinstance(content, str):
+                    self._assign_formula(name, content)
+                else:
+                    self._assign_value(name, content)
+        except Exception:
+            for state in reversed(saved):
+                self._restore_cell(state)
+            self.dirty = dirty
+            raise
+        self.recalculate()
+
+    def get(self, name: str) -> float:
+        """
+        Значение ячейки.
+
+        Raises:
+            KeyError: Если ячейка не задана
+            ValueError: Если при вычислении ячейки произошла ошибка
+        """
+        if name in self.errors:
+            raise ValueError(f"Ячейка {name}: {self.errors[name]}")
+        return self.values[name]
+
+    def _save_cell(self, name: str) -> tuple:
+        """Снимок ячейки для отката update."""
+        fields = {table: getattr(self, table)[name]
+                  for table in ("values", "errors", "formulas", "functions")
+                  if name in getattr(self, table)}
+        dependencies = self.dependencies.get(name)
+        return name, fields, None if dependencies is None else set(dependencies)
+
+    def _restore_cell(self, state: tuple):
+        """Восстановление ячейки и её рёбер в графе по снимку _save_cell."""
+        name, fields, dependencies = state
+        for table in ("values", "errors", "formulas", "functions"):
+            if table in fields:
+                getattr(self, table)[name] = fields[table]
+            else:
+                getattr(self, table).pop(name, None)
+        self._set_dependencies(name, dependencies or ())
+        if dependencies is None:
+            del self.dependencies[name]
+
+    def _assign_value(self, name: str, value: float):
+        self._set_dependencies(name, ())
+        self.formulas.pop(name, None)
+        self.functions.pop(name, None)
+        self.errors.pop(name, None)
+        self.values[name] = float(value)
+        self._mark_dirty(name)
+        self.dirty.discard(name)
+
+    def _assign_formula(self, name: str, expression: str):
+        function = self.calculator.compile(expression)
+        dependencies = set(function.variables)
+        if self._creates_cycle(name, dependencies):
+            raise ValueError(f"Циклическая зависимость в ячейке {name}")
+        self._set_dependencies(name, dependencies)
+        self.formulas[name] = expression
+        self.functions[name] = function
+        self._mark_dirty(name)
+
+    def _set_dependencies(self, name: str, dependencies):
+        for old in self.dependencies.get(name, ()):
+            self.dependents[old].discard(name)
+        self.dependencies[name] = set(dependencies)
+        for dependency in dependencies:
+            self.dependents.setdefault(dependency, set()).add(name)
+
+    def _creates_cycle(self, name: str, dependencies: set) -> bool:
+        """
+        Проверка: достижима ли какая-либо зависимость из ячейки name
+        по рёбрам «от ячейки к зависимым».
+
+        Временная сложность: O(V + E) в худшем случае
+        """
+        if name in dependencies:
+            return True
+        visited = {name}
+        stack = [name]
+        while stack:
+            for dependent in self.dependents.get(stack.pop(), ()):
+                if dependent in dependencies:
+                    return True
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append(dependent)
+        return False
+
+    def _mark_dirty(self, name: str):
+        """Пометка ячейки и всех транзитивно зависимых от неё."""
+        stack = [name]
+        while stack:
+            cell = stack.pop()
+            if cell in self.dirty:
+                continue
+            self.dirty.add(cell)
+            stack.extend(self.dependents.get(cell, ()))
+
+    def recalculate(self):
+        """
+        Пересчёт «грязных» формул в топологическом порядке.
+
+        Временная сложность: O(k), где k - количество грязных ячеек и их связей
+        """
+        dirty = self.dirty
+        if not dirty:
+            return
+
+        in_degree = {}
+        for cell in dirty:
+            in_degree[cell] = sum(1 for d in self.dependencies.get(cell, ()) if d in dirty)
+
+        ready = deque(cell for cell, degree in in_degree.items() if degree == 0)
+        processed = 0
+        while ready:
+            cell = ready.popleft()
+            processed += 1
+            self._evaluate(cell)
+            for dependent in self.dependents.get(cell, ()):
+                if dependent in in_degree:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        ready.append(dependent)
+
+        self.dirty = set()
+        if processed != len(in_degree):
+            raise ValueError("Обнаружена циклическая зависимость")
+
+    def recalculate_all(self):
+        """
+        Полный пересчёт всех формул (для сравнения с инкрементальным).
+
+        Временная сложность: O(V + E)
+        """
+        for name in self.formulas:
+            self.dirty.add(name)
+        self.recalculate()
+
+    def _evaluate(self, cell: str):
+        function = self.functions.get(cell)
+        if function is None:
+            return
+        self.evaluations += 1
+        self.errors.pop(cell, None)
+        try:
+            arguments = []
+            for dependency in function.variables:
+                if dependency in self.errors:
+                    raise ValueError(f"ошибка в ячейке {dependency}")
+                if dependency not in self.values:
+                    raise ValueError(f"ячейка {dependency} не задана")
+                arguments.append(self.values[dependency])
+            self.values[cell] = function(*arguments)
+        except (ValueError, ArithmeticError) as error:
+            self.values.pop(cell, None)
+            self.errors[cell] = error
+
+    def __len__(self):
+        return len(self.values) + len(self.errors)
+
+
+def compare_incremental_recalculation(inputs: int = 100, formulas_per_input: int = 200):
+    """
+    Сравнение полного и инкрементального пересчёта при изменении одной ячейки.
+
+    Таблица: inputs независимых цепочек формул длиной formulas_per_input.
+    """
+    sheet = Spreadsheet()
+    cells = {}
+    for i in range(inputs):
+        cells[f"in{i}"] = float(i)
+        previous = f"in{i}"
+        for j in range(formulas_per_input):
+            name = f"c{i}x{j}"
+            cells[name] = f"{previous} * 2 + {j} / (1 + in{i})"
+            previous = name
+    sheet.update(cells)
+    total = inputs * formulas_per_input
+
+    print("=== Сравнение пересчёта таблицы ===")
+    print(f"Формул: {total}")
+
+    sheet.evaluations = 0
+    start_time = time.time()
+    sheet.set_value("in0", 0.5)
+    sheet.recalculate_all()
+    full_time = time.time() - start_time
+    print(f"Полный пересчёт: {full_time:.4f} сек, вычислений: {sheet.evaluations}")
+
+    sheet.evaluations = 0
+    start_time = time.time()
+    sheet.set_value("in0", 1.5)
+    incremental_time = time.time() - start_time
+    print(f"Инкрементальный пересчёт: {incremental_time:.4f} сек, "
+          f"вычислений: {sheet.evaluations}")
+
+    print(f"\nУскорение: {full_time / incremental_time:.2f}x")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование таблицы ===")
+    sheet = Spreadsheet()
+    sheet.update({"A1": 2, "A2": 3, "B1": "A1 + A2", "C1": "B1 * 2", "D1": "A2 ^ 2"})
+    print(f"B1 = {sheet.get('B1')}, C1 = {sheet.get('C1')}, D1 = {sheet.get('D1')}")
+
+    sheet.evaluations = 0
+    sheet.set_value("A1", 10)
+    print(f"После A1 = 10: B1 = {sheet.get('B1')}, C1 = {sheet.get('C1')}, "
+          f"D1 = {sheet.get('D1')}, пересчитано формул: {sheet.evaluations}")
+
+    try:
+        sheet.set_formula("A1", "C1 + 1")
+    except ValueError as error:
+        print(f"set_formula('A1', 'C1 + 1'): {error}")
+
+    try:
+        sheet.update({"A2": 100, "B1": "C1 * 2"})
+    except ValueError as error:
+        print(f"update(A2 = 100, B1 = C1 * 2): {error}; A2 = {sheet.get('A2')}, "
+              f"формула B1: {sheet.formulas['B1']}")
+
+    sheet.set_value("A2", -10)
+    sheet.set_formula("E1", "1 / (A1 + A2)")
+    try:
+        sheet.get("E1")
+    except ValueError as error:
+        print(f"E1: {error}")
+
+    print()
+    compare_incremental_recalculation()
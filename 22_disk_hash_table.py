@@ -0,0 +1,559 @@
+"""
+Задание 22. Хэш-таблица на диске
+
+Постоянная хэш-таблица с интерфейсом put/get/remove для наборов ключей,
+не помещающихся в память в виде объектов Python. Индекс - массив слотов
+фиксированного размера в файле, отображённом через mmap; ключи и значения
+дописываются в конец файла данных.
+"""
+
+import os
+import sys
+import mmap
+import time
+import pickle
+import struct
+import tempfile
+import importlib.util
+
+spec = importlib.util.spec_from_file_location("hash_table_module", "08_hash_table.py")
+hash_table_module = importlib.util.module_from_spec(spec)
+sys.modules["hash_table_module"] = hash_table_module
+spec.loader.exec_module(hash_table_module)
+HashTable = hash_table_module.HashTable
+fnv1a_hash = hash_table_module.fnv1a_hash
+MASK64 = hash_table_module.MASK64
+FIBONACCI_MULTIPLIER = hash_table_module.FIBONACCI_MULTIPLIER
+
+INDEX_MAGIC = b"DHTIDX01"
+DATA_MAGIC = b"DHTDAT01"
+
+# Заголовок индекса: сигнатура, вместимость, размер, зерно хэша,
+# конец данных, объём мёртвых записей в файле данных, поколение файла
+# данных и признак чистого закрытия
+_INDEX_HEADER = struct.Struct("<8sQQQQQQQ")
+_INDEX_HEADER_SIZE = 64
+# Слот: полный хэш ключа и смещение записи в файле данных (0 - пустой слот)
+_SLOT = struct.Struct("<QQ")
+# Запись данных: длина ключа и длина значения, затем ключ и значение
+_RECORD = struct.Struct("<II")
+# Сколько байтов читать за раз: короткая запись читается одним вызовом
+_READ_AHEAD = 256
+
+
+class DiskHashTable:
+    """
+    Хэш-таблица с открытой адресацией на диске.
+
+    Файлы таблицы: path + ".idx" (заголовок и слоты) и path + ".N.dat"
+    (записи), где N - поколение данных из заголовка индекса. Слоты,
+    как в OpenAddressingHashTable, хранят полный хэш: при поиске запись
+    читается только при совпадении хэша, а расширение индекса не читает
+    файл данных. Поиск просматривает короткий отрезок соседних слотов
+    (обычно одна страница) и одну запись.
+
+    Файл данных только дописывается: при обновлении и удалении старая
+    запись становится мёртвой и убирается офлайн-сжатием (compact).
+
+    Запись сначала дописывается в файл данных, затем в заголовок индекса
+    записываются новые размер и конец данных, и только после этого слот
+    публикуется через mmap. Первое изменение после flush() снимает
+    в заголовке признак чистого закрытия. Открытие чисто закрытой таблицы
+    читает только заголовок - O(1) независимо от размера; после аварийного
+    завершения индекс перестраивается без слотов, указывающих за конец
+    данных, - O(capacity).
+    """
+
+    MAX_LOAD_FACTOR = 0.75
+
+    def __init__(self, path: str, capacity: int = 1024):
+        """
+        Открытие таблицы или создание новой, если файлов нет.
+
+        Временная сложность: O(1) при открытии, O(capacity) при создании
+
+        Args:
+            path: Путь к таблице без расширения
+            capacity: Начальное количество слотов новой таблицы
+                      (округляется вверх до степени двойки)
+
+        Raises:
+            ValueError: Если файлы повреждены или не являются таблицей
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+
+        if not os.path.exists(self.index_path):
+            size = 8
+            while size < capacity:
+                size *= 2
+            with open(_data_path(path, 0), "wb") as file:
+                file.write(DATA_MAGIC)
+            _create_index(self.index_path, size, int.from_bytes(os.urandom(8), "little"),
+                          len(DATA_MAGIC))
+
+        self._open_index()
+        self.data_path = _data_path(path, self.generation)
+        try:
+            self._data = open(self.data_path, "r+b", buffering=0)
+        except FileNotFoundError:
+            self._map.close()
+            self._index_file.close()
+            raise ValueError("Файл данных таблицы не найден")
+        if self._data.read(len(DATA_MAGIC)) != DATA_MAGIC:
+            self._data.close()
+            self.close()
+            raise ValueError("Файл данных не является файлом таблицы")
+        data_size = os.fstat(self._data.fileno()).st_size
+        if not self.clean or data_size != self.data_end:
+            self._recover(min(data_size, self.data_end))
+
+    def _open_index(self):
+        self._index_file = open(self.index_path, "r+b")
+        self._map = mmap.mmap(self._index_file.fileno(), 0)
+        (magic, capacity, size, seed, data_end, garbage,
+         generation, clean) = _INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self._map.close()
+            self._index_file.close()
+            raise ValueError("Файл индекса не является файлом таблицы")
+        self.capacity = capacity
+        self.size = size
+        self.seed = seed
+        self.data_end = data_end
+        self.garbage = garbage
+        self.generation = generation
+        self.clean = clean
+        self._mask = capacity - 1
+        self._shift = 64 - (capacity.bit_length() - 1)
+
+    def _write_header(self):
+        _INDEX_HEADER.pack_into(self._map, 0, INDEX_MAGIC, self.capacity, self.size,
+                                self.seed, self.data_end, self.garbage,
+                                self.generation, self.clean)
+
+    def _mark_dirty(self):
+        """Снятие признака чистого закрытия перед первым изменением после flush()."""
+        if self.clean:
+            self.clean = 0
+            self._write_header()
+            self._map.flush(0, _INDEX_HEADER_SIZE)
+
+    def _record_size(self, offset: int, end: int) -> int:
+        """
+        Полный размер записи или 0, если запись не умещается
+        в первые end байтов файла данных.
+        """
+        if offset < len(DATA_MAGIC) or offset + _RECORD.size > end:
+            return 0
+        self._data.seek(offset)
+        key_length, value_length = _RECORD.unpack(self._data.read(_RECORD.size))
+        size = _RECORD.size + key_length + value_length
+        return size if offset + size <= end else 0
+
+    def _recover(self, end: int):
+        """
+        Восстановление после аварийного завершения.
+
+        Индекс перестраивается только из слотов, записи которых целиком
+        лежат в первых end байтах файла данных; повторные слоты одной
+        записи (прерванный сдвиг при удалении) учитываются один раз.
+        Размер и объём мёртвых записей пересчитываются, хвост файла
+        данных за end отбрасывается.
+
+        Временная сложность: O(capacity)
+        """
+        self.data_end = end
+        self._rebuild_index(self.capacity, recover=True)
+        self._data.truncate(end)
+        self.flush()
+
+    def _hash(self, key: str) -> int:
+        """Полный 64-битный хэш ключа (FNV-1a с зерном таблицы)."""
+        return fnv1a_hash(key, self.seed)
+
+    def _home(self, hash_value: int) -> int:
+        """Домашний слот: старшие биты хэша после фибоначчиева перемешивания."""
+        return ((hash_value * FIBONACCI_MULTIPLIER) & MASK64) >> self._shift
+
+    def _read_record(self, offset: int):
+        """
+        Чтение записи из файла данных.
+
+        Returns:
+            (ключ в UTF-8, сериализованное значение, полный размер записи)
+        """
+        data = self._data
+        data.seek(offset)
+        chunk = data.read(_READ_AHEAD)
+        key_length, value_length = _RECORD.unpack_from(chunk, 0)
+        end = _RECORD.size + key_length + value_length
+        if len(chunk) < end:
+            data.seek(offset)
+            chunk = data.read(end)
+        key = chunk[_RECORD.size:_RECORD.size + key_length]
+        return key, chunk[_RECORD.size + key_length:end], end
+
+    def _append_record(self, key: bytes, value: bytes) -> int:
+        """
+        Дописывание записи в конец файла данных.
+
+        Returns:
+            Смещение записи
+        """
+        offset = self.data_end
+        record = _RECORD.pack(len(key), len(value)) + key + value
+        self._data.seek(offset)
+        self._data.write(record)
+        self.data_end = offset + len(record)
+        return offset
+
+    def _find(self, key: bytes, hash_value: int):
+        """
+        Поиск слота ключа.
+
+        Returns:
+            (позиция слота в индексе, смещение записи или 0, если ключ не найден)
+        """
+        memory = self._map
+        mask = self._mask
+        index = self._home(hash_value)
+        while True:
+            position = _INDEX_HEADER_SIZE + index * _SLOT.size
+            slot_hash, offset = _SLOT.unpack_from(memory, position)
+            if offset == 0:
+                return position, 0
+            if slot_hash == hash_value and self._read_record(offset)[0] == key:
+                return position, offset
+            index = (index + 1) & mask
+
+    def put(self, key: str, value):
+        """
+        Добавление или обновление пары ключ-значение.
+
+        Значение сериализуется pickle и дописывается в файл данных.
+
+        Временная сложность: O(1) в среднем случае
+        """
+        self._check_open()
+        self._mark_dirty()
+        hash_value = self._hash(key)
+        encoded = key.encode("utf-8")
+        position, old_offset = self._find(encoded, hash_value)
+        offset = self._append_record(encoded, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if old_offset:
+            self.garbage += self._read_record(old_offset)[2]
+        else:
+            self.size += 1
+        self._write_header()
+        _SLOT.pack_into(self._map, position, hash_value, offset)
+
+        if self.size > self.capacity * self.MAX_LOAD_FACTOR:
+            self._resize()
+
+    def get(self, key: str):
+        """
+        Получение значения по ключу.
+
+        Временная сложность: O(1) в среднем случае
+
+        Returns:
+            Значение или None, если ключ не найден
+        """
+        self._check_open()
+        position, offset = self._find(key.encode("utf-8"), self._hash(key))
+        if not offset:
+            return None
+        return pickle.loads(self._read_record(offset)[1])
+
+    def remove(self, key: str) -> bool:
+        """
+        Удаление ключа обратным сдвигом слотов (как в OpenAddressingHashTable).
+
+        Временная сложность: O(1) в среднем случае
+
+        Returns:
+            True если ключ был удален, False если не найден
+        """
+        self._check_open()
+        position, offset = self._find(key.encode("utf-8"), self._hash(key))
+        if not offset:
+            return False
+        self._mark_dirty()
+        self.garbage += self._read_record(offset)[2]
+        self.size -= 1
+        self._write_header()
+
+        memory = self._map
+        mask = self._mask
+        hole = (position - _INDEX_HEADER_SIZE) // _SLOT.size
+        index = hole
+        while True:
+            index = (index + 1) & mask
+            slot_position = _INDEX_HEADER_SIZE + index * _SLOT.size
+            slot_hash, slot_offset = _SLOT.unpack_from(memory, slot_position)
+            if slot_offset == 0:
+                break
+            home = self._home(slot_hash)
+            if ((index - home) & mask) >= ((index - hole) & mask):
+                _SLOT.pack_into(memory, _INDEX_HEADER_SIZE + hole * _SLOT.size,
+                                slot_hash, slot_offset)
+                hole = index
+        _SLOT.pack_into(memory, _INDEX_HEADER_SIZE + hole * _SLOT.size, 0, 0)
+        return True
+
+    def _resize(self):
+        """
+        Увеличение индекса в 2 раза.
+
+        Новый индекс строится по сохранённым хэшам (файл данных не читается).
+
+        Временная сложность: O(capacity)
+        """
+        self._rebuild_index(self.capacity * 2)
+
+    def _rebuild_index(self, capacity: int, recover: bool = False):
+        """
+        Построение индекса заданной вместимости во временном файле
+        и атомарная замена старого.
+
+        Args:
+            capacity: Вместимость нового индекса
+            recover: Проверять записи слотов (см. _recover)
+        """
+        temporary_path = self.index_path + ".tmp"
+        _create_index(temporary_path, capacity, self.seed, self.data_end,
+                      generation=self.generation, clean=0)
+        size = 0
+        live = 0
+        seen = set()
+        with open(temporary_path, "r+b") as file:
+            memory = mmap.mmap(file.fileno(), 0)
+            mask = capacity - 1
+            shift = 64 - (capacity.bit_length() - 1)
+            old = self._map
+            for position in range(_INDEX_HEADER_SIZE, len(old), _SLOT.size):
+                slot_hash, offset = _SLOT.unpack_from(old, position)
+                if offset == 0:
+                    continue
+                if recover:
+                    record_size = self._record_size(offset, self.data_end)
+                    if not record_size or offset in seen:
+                        continue
+                    seen.add(offset)
+                    live += record_size
+                index = ((slot_hash * FIBONACCI_MULTIPLIER) & MASK64) >> shift
+                while _SLOT.unpack_from(memory, _INDEX_HEADER_SIZE + index * _SLOT.size)[1]:
+                    index = (index + 1) & mask
+                _SLOT.pack_into(memory, _INDEX_HEADER_SIZE + index * _SLOT.size,
+                                slot_hash, offset)
+                size += 1
+            if recover:
+                self.size = size
+                self.garbage = self.data_end - len(DATA_MAGIC) - live
+            _INDEX_HEADER.pack_into(memory, 0, INDEX_MAGIC, capacity, self.size, self.seed,
+                                    self.data_end, self.garbage, self.generation, 0)
+            memory.flush()
+            memory.close()
+
+        self._map.close()
+        self._index_file.close()
+        os.replace(temporary_path, self.index_path)
+        self._open_index()
+
+    def items(self):
+        """
+        Все пары ключ-значение (в порядке слотов).
+
+        Временная сложность: O(capacity + суммарного размера записей)
+        """
+        self._check_open()
+        memory = self._map
+        for position in range(_INDEX_HEADER_SIZE, len(memory), _SLOT.size):
+            offset = _SLOT.unpack_from(memory, position)[1]
+            if offset:
+                key, value, _ = self._read_record(offset)
+                yield key.decode("utf-8"), pickle.loads(value)
+
+    def flush(self):
+        """
+        Запись заголовка и сброс индекса и данных на диск.
+
+        Сначала сбрасываются данные, затем индекс с признаком чистого
+        закрытия, поэтому индекс на диске не ссылается на несохранённые записи.
+        """
+        self._check_open()
+        os.fsync(self._data.fileno())
+        self.clean = 1
+        self._write_header()
+        self._map.flush()
+
+    def close(self):
+        """Сброс на диск и закрытие файлов."""
+        if self._map is None:
+            return
+        if not self._data.closed:
+            self.flush()
+            self._data.close()
+        self._map.close()
+        self._index_file.close()
+        self._map = None
+
+    def _check_open(self):
+        if self._map is None:
+            raise ValueError("Таблица закрыта")
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _data_path(path: str, generation: int) -> str:
+    """Путь к файлу данных заданного поколения."""
+    return f"{path}.{generation}.dat"
+
+
+def _create_index(path: str, capacity: int, seed: int, data_end: int,
+                  size: int = 0, garbage: int = 0, generation: int = 0, clean: int = 1):
+    """Создание файла индекса с пустыми слотами (файл расширяется без записи нулей)."""
+    with open(path, "wb") as file:
+        file.write(_INDEX_HEADER.pack(INDEX_MAGIC, capacity, size, seed, data_end, garbage,
+                                      generation, clean))
+        file.truncate(_INDEX_HEADER_SIZE + capacity * _SLOT.size)
+
+
+def compact(path: str) -> dict:
+    """
+    Офлайн-сжатие таблицы: перенос живых записей в новый файл данных.
+
+    Таблица не должна быть открыта. Живые записи переносятся в файл
+    данных следующего поколения, новый индекс пишется во временный файл
+    и одной атомарной заменой файла индекса переключает таблицу на новое
+    поколение; после этого старый файл данных удаляется. При сбое до замены
+    остаётся прежняя таблица, после - новая. Вместимость нового индекса
+    подбирается по количеству живых ключей.
+
+    Временная сложность: O(capacity + суммарного размера живых записей)
+
+    Returns:
+        Размер файла данных до и после сжатия
+    """
+    source = DiskHashTable(path)
+    before = source.data_end
+    generation = source.generation + 1
+    temporary = path + ".compact"
+    capacity = 8
+    while source.size > capacity * DiskHashTable.MAX_LOAD_FACTOR:
+        capacity *= 2
+    with open(_data_path(temporary, generation), "wb") as file:
+        file.write(DATA_MAGIC)
+    _create_index(temporary + ".idx", capacity, source.seed, len(DATA_MAGIC),
+                  generation=generation)
+
+    with DiskHashTable(temporary) as target:
+        memory = source._map
+        for position in range(_INDEX_HEADER_SIZE, len(memory), _SLOT.size):
+            slot_hash, offset = _SLOT.unpack_from(memory, position)
+            if offset == 0:
+                continue
+            key, value, _ = source._read_record(offset)
+            new_offset = target._append_record(key, value)
+            index = target._home(slot_hash)
+            while _SLOT.unpack_from(target._map, _INDEX_HEADER_SIZE + index * _SLOT.size)[1]:
+                index = (index + 1) & target._mask
+            _SLOT.pack_into(target._map, _INDEX_HEADER_SIZE + index * _SLOT.size,
+                            slot_hash, new_offset)
+            target.size += 1
+        after = target.data_end
+    source.close()
+
+    # Файл данных нового поколения ещё не виден индексу, поэтому его
+    # переименование безопасно; переключает таблицу только замена индекса
+    os.replace(_data_path(temporary, generation), _data_path(path, generation))
+    os.replace(temporary + ".idx", source.index_path)
+    os.remove(source.data_path)
+    return {"before": before, "after": after}
+
+
+def compare_with_hash_table(n: int = 200000):
+    """
+    Сравнение DiskHashTable с HashTable в памяти: вставка, поиск,
+    время открытия и размер файлов до и после сжатия.
+    """
+    keys = [f"key{i}" for i in range(n)]
+
+    print("=== Сравнение DiskHashTable и HashTable ===")
+    print(f"Количество ключей: {n}")
+
+    table = HashTable()
+    start_time = time.time()
+    for i, key in enumerate(keys):
+        table.put(key, i)
+    put_time = time.time() - start_time
+    start_time = time.time()
+    for key in keys:
+        table.get(key)
+    get_time = time.time() - start_time
+    print(f"HashTable: put {n / put_time:,.0f} оп/сек, get {n / get_time:,.0f} оп/сек")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "table")
+        with DiskHashTable(path) as disk:
+            start_time = time.time()
+            for i, key in enumerate(keys):
+                disk.put(key, i)
+            put_time = time.time() - start_time
+            start_time = time.time()
+            for key in keys:
+                disk.get(key)
+            get_time = time.time() - start_time
+        print(f"DiskHashTable: put {n / put_time:,.0f} оп/сек, get {n / get_time:,.0f} оп/сек")
+
+        start_time = time.time()
+        disk = DiskHashTable(path)
+        open_time = time.time() - start_time
+        print(f"Открытие таблицы из {len(disk)} ключей: {open_time * 1000:.3f} мс")
+        print(f"Данные сохранены после открытия: {disk.get(keys[-1]) == n - 1}")
+
+        for key in keys[::2]:
+            disk.remove(key)
+        for key in keys[1::4]:
+            disk.put(key, -1)
+        disk.close()
+
+        result = compact(path)
+        print(f"Сжатие после удаления половины ключей и обновления четверти: "
+              f"{result['before']:,} -> {result['after']:,} байт")
+        with DiskHashTable(path) as disk:
+            intact = (len(disk) == n // 2 and disk.get(keys[1]) == -1
+                      and disk.get(keys[3]) == 3 and disk.get(keys[0]) is None)
+            print(f"Данные сохранены после сжатия: {intact}")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование хэш-таблицы на диске ===")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fruits")
+        with DiskHashTable(path, capacity=8) as table:
+            for i, word in enumerate(["apple", "banana", "cherry", "date", "elderberry", "fig", "grape"]):
+                table.put(word, i + 1)
+            table.put("apple", {"count": 10})
+            table.remove("banana")
+            print(f"Вместимость после расширения: {table.capacity}")
+
+        with DiskHashTable(path) as table:
+            print(f"После повторного открытия: get('apple') = {table.get('apple')}, "
+                  f"get('banana') = {table.get('banana')}, размер = {len(table)}")
+            print(f"Элементы: {sorted(table.items(), key=lambda item: item[0])}")
+
+        print(f"Сжатие: {compact(path)}")
+        with DiskHashTable(path) as table:
+            print(f"После сжатия: get('cherry') = {table.get('cherry')}, размер = {len(table)}")
+
+    print()
+    compare_with_hash_table()
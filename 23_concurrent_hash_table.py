@@ -0,0 +1,304 @@
+"""
+Задание 23. Потокобезопасная хэш-таблица
+
+Хэш-таблица с цепочками, в которой массив корзин разбит на полосы
+(stripes) с отдельной блокировкой у каждой. Чтение выполняется без
+блокировок. Сравнение с HashTable под одной общей блокировкой.
+"""
+
+import sys
+import time
+import random
+import secrets
+import threading
+import importlib.util
+
+spec = importlib.util.spec_from_file_location("hash_table_module", "08_hash_table.py")
+hash_table_module = importlib.util.module_from_spec(spec)
+sys.modules["hash_table_module"] = hash_table_module
+spec.loader.exec_module(hash_table_module)
+HashTable = hash_table_module.HashTable
+resolve_hash_function = hash_table_module.resolve_hash_function
+
+
+class ConcurrentHashTable:
+    """
+    Хэш-таблица с блокировками по полосам.
+
+    Корзина index относится к полосе index % stripes. Вместимость всегда
+    кратна stripes, поэтому при удвоении корзины index и index + capacity
+    остаются в той же полосе, и номер полосы зависит только от хэша.
+
+    Корзины - неизменяемые кортежи элементов (key, value, hash): запись
+    строит новый кортеж и одним присваиванием публикует его в массиве.
+    Поэтому get читает корзины без блокировки и видит либо старое, либо
+    новое состояние корзины, но не промежуточное. Расширение берёт
+    блокировки всех полос по порядку и публикует новый массив одним
+    присваиванием self._buckets.
+    """
+
+    MAX_LOAD_FACTOR = 0.75
+
+    def __init__(self, capacity: int = 64, stripes: int = 16, hash_function="djb2",
+                 seed: int = None):
+        """
+        Инициализация таблицы.
+
+        Args:
+            capacity: Начальная вместимость (округляется вверх до кратной stripes)
+            stripes: Количество полос (блокировок)
+            hash_function: Имя из HASH_FUNCTIONS или функция f(key, seed) -> int
+            seed: Зерно хэш-функции (None - случайное)
+        """
+        if stripes <= 0:
+            raise ValueError("Количество полос должно быть положительным")
+        capacity = max(capacity, stripes)
+        capacity += -capacity % stripes
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._sizes = [0] * stripes
+        self._buckets = [() for _ in range(capacity)]
+        self.hash_function = resolve_hash_function(hash_function)
+        self.seed = secrets.randbits(64) if seed is None else seed
+        self.resizes = 0
+
+    def _hash(self, key: str) -> int:
+        return self.hash_function(key, self.seed)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buckets)
+
+    def get(self, key: str):
+        """
+        Получение значения по ключу без блокировки.
+
+        Временная сложность: O(1) в среднем случае
+
+        Returns:
+            Значение или None, если ключ не найден
+        """
+        hash_value = self._hash(key)
+        buckets = self._buckets
+        for k, v, h in buckets[hash_value % len(buckets)]:
+            if h == hash_value and k == key:
+                return v
+        return None
+
+    def put(self, key: str, value):
+        """
+        Добавление или обновление пары ключ-значение под блокировкой полосы.
+
+        Временная сложность: O(1) в среднем случае
+        """
+        hash_value = self._hash(key)
+        stripe = hash_value % self.stripes
+        with self._locks[stripe]:
+            buckets = self._buckets
+            index = hash_value % len(buckets)
+            bucket = buckets[index]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    buckets[index] = bucket[:i] + ((key, value, hash_value),) + bucket[i + 1:]
+                    return
+            buckets[index] = bucket + ((key, value, hash_value),)
+            self._sizes[stripe] += 1
+            grow = self._sizes[stripe] > len(buckets) // self.stripes * self.MAX_LOAD_FACTOR
+        if grow:
+            self._resize(len(buckets))
+
+    def increment(self, key: str, delta=1):
+        """
+        Атомарное увеличение значения на delta (отсутствующий ключ считается 0).
+
+        Временная сложность: O(1) в среднем случае
+
+        Returns:
+            Новое значение
+        """
+        hash_value = self._hash(key)
+        stripe = hash_value % self.stripes
+        with self._locks[stripe]:
+            buckets = self._buckets
+            index = hash_value % len(buckets)
+            bucket = buckets[index]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    value = v + delta
+                    buckets[index] = bucket[:i] + ((key, value, hash_value),) + bucket[i + 1:]
+                    return value
+            buckets[index] = bucket + ((key, delta, hash_value),)
+            self._sizes[stripe] += 1
+            grow = self._sizes[stripe] > len(buckets) // self.stripes * self.MAX_LOAD_FACTOR
+        if grow:
+            self._resize(len(buckets))
+        return delta
+
+    def remove(self, key: str) -> bool:
+        """
+        Удаление пары ключ-значение под блокировкой полосы.
+
+        Временная сложность: O(1) в среднем случае
+
+        Returns:
+            True если ключ был удален, False если не найден
+        """
+        hash_value = self._hash(key)
+        stripe = hash_value % self.stripes
+        with self._locks[stripe]:
+            buckets = self._buckets
+            index = hash_value % len(buckets)
+            bucket = buckets[index]
+            for i, (k, v, h) in enumerate(bucket):
+                if h == hash_value and k == key:
+                    buckets[index] = bucket[:i] + bucket[i + 1:]
+                    self._sizes[stripe] -= 1
+                    return True
+        return False
+
+    def _resize(self, expected_capacity: int):
+        """
+        Удвоение массива корзин под блокировками всех полос.
+
+        Если другой поток уже расширил таблицу, ничего не делается.
+        Элементы переносятся по сохранённым хэшам.
+
+        Временная сложность: O(n)
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            buckets = self._buckets
+            if len(buckets) != expected_capacity:
+                return
+            capacity = len(buckets) * 2
+            new_buckets = [[] for _ in range(capacity)]
+            for bucket in buckets:
+                for entry in bucket:
+                    new_buckets[entry[2] % capacity].append(entry)
+            self._buckets = [tuple(bucket) for bucket in new_buckets]
+            self.resizes += 1
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def items(self):
+        """Все пары ключ-значение (снимок массива корзин без блокировки)."""
+        for bucket in self._buckets:
+            for k, v, _ in bucket:
+                yield (k, v)
+
+    def __len__(self):
+        return sum(self._sizes)
+
+
+class LockedHashTable:
+    """
+    HashTable под одной общей блокировкой (для сравнения).
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._table = HashTable(capacity)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            return self._table.get(key)
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._table.put(key, value)
+
+    def increment(self, key: str, delta=1):
+        with self._lock:
+            return self._table.increment(key, delta)
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            return self._table.remove(key)
+
+    def __len__(self):
+        return self._table.size
+
+
+def _run_workload(table, threads: int, operations: int, keys: list, read_share: float) -> float:
+    """
+    Запуск threads потоков, каждый выполняет operations случайных операций.
+
+    Returns:
+        Время выполнения в секундах
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        plan = [(rng.random() < read_share, rng.choice(keys)) for _ in range(operations)]
+        barrier.wait()
+        for is_read, key in plan:
+            if is_read:
+                table.get(key)
+            else:
+                table.increment(key)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start_time = time.time()
+    for thread in workers:
+        thread.join()
+    return time.time() - start_time
+
+
+def compare_with_global_lock(threads: int = 4, operations: int = 100000, key_count: int = 10000):
+    """
+    Сравнение блокировок по полосам и общей блокировки на нагрузках
+    с преобладанием чтения (95%) и записи (50%).
+    """
+    keys = [f"key{i}" for i in range(key_count)]
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+    print("=== Сравнение ConcurrentHashTable и общей блокировки ===")
+    print(f"Потоков: {threads}, операций на поток: {operations}, ключей: {key_count}, "
+          f"GIL: {'включён' if gil else 'выключен'}")
+
+    for name, read_share in (("Чтение 95%", 0.95), ("Запись 50%", 0.5)):
+        print(f"\n{name}:")
+        times = {}
+        for table_class in (LockedHashTable, ConcurrentHashTable):
+            table = table_class()
+            for key in keys:
+                table.put(key, 0)
+            elapsed = _run_workload(table, threads, operations, keys, read_share)
+            times[table_class] = elapsed
+            print(f"  {table_class.__name__}: {elapsed:.4f} сек, "
+                  f"{threads * operations / elapsed:,.0f} операций/сек")
+        print(f"  Ускорение: {times[LockedHashTable] / times[ConcurrentHashTable]:.2f}x")
+
+
+if __name__ == "__main__":
+    print("=== Тестирование ConcurrentHashTable ===")
+    table = ConcurrentHashTable(capacity=8, stripes=4)
+    for i, word in enumerate(["apple", "banana", "cherry", "date", "elderberry"]):
+        table.put(word, i + 1)
+    table.remove("banana")
+    print(f"get('apple') = {table.get('apple')}, get('banana') = {table.get('banana')}")
+
+    counters = ConcurrentHashTable(capacity=8, stripes=4)
+    words = [f"word{i % 50}" for i in range(1000)]
+
+    def count_words():
+        for word in words:
+            counters.increment(word)
+
+    workers = [threading.Thread(target=count_words) for _ in range(4)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    print(f"Подсчёт в 4 потоках: ключей {len(counters)}, "
+          f"сумма {sum(v for _, v in counters.items())} (ожидается 4000), "
+          f"вместимость {counters.capacity}, расширений {counters.resizes}")
+
+    print()
+    compare_with_global_lock()